@@ -3,15 +3,27 @@
 from __future__ import annotations
 
 import contextlib
+import functools
+import json
 import math
+import typing as t
+from datetime import datetime, timedelta, timezone
 from functools import cached_property
 from http import HTTPStatus
 
+import requests
+from singer_sdk import metrics
 from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.pagination import SinglePagePaginator
 from singer_sdk.streams import RESTStream
 from typing_extensions import override
 
 from tap_outbrain.auth import OutbrainAuthenticator
+from tap_outbrain.dedup import BloomFilter
+from tap_outbrain.fingerprints import DateFingerprints, RecordFingerprints
+from tap_outbrain.health import RetryBudgetExhaustedError
+from tap_outbrain.pipeline import FetchPipeline, PipelineMetric
+from tap_outbrain.state import PartitionStateManager
 
 
 class OutbrainStream(RESTStream):
@@ -24,6 +36,169 @@ class OutbrainStream(RESTStream):
     def authenticator(self):
         return OutbrainAuthenticator.create_for_stream(self)
 
+    @override
+    @property
+    def state_manager(self):
+        if self._state_manager is None:
+            self._state_manager = PartitionStateManager(
+                tap_name=self.tap_name,
+                stream_name=self.name,
+                tap_state=self.tap_state,
+                state_partitioning_keys=self.state_partitioning_keys,
+                is_sorted=self.is_sorted,
+                check_sorted=self.check_sorted,
+            )
+
+        return self._state_manager
+
+    @override
+    @property
+    def emit_activate_version_messages(self):
+        # unchanged records are not emitted, so must not be deactivated
+        return not self.changed_only and super().emit_activate_version_messages
+
+    @override
+    def _sync_records(self, context=None, *, write_messages=True):
+        if (profiler := self._tap.profiler) is None:
+            yield from super()._sync_records(context, write_messages=write_messages)
+            return
+
+        with profiler.profile(self.name):
+            yield from super()._sync_records(context, write_messages=write_messages)
+
+    @override
+    def get_records(self, context):
+        self._duplicate_count = 0
+        self._fingerprints = (
+            self._get_fingerprints(context)
+            if self.changed_only and self.selected
+            else None
+        )
+
+        yield from super().get_records(context)
+
+        if self._duplicate_count:
+            self.logger.info(
+                "Suppressed %d duplicate record(s) for context: %s",
+                self._duplicate_count,
+                context,
+            )
+
+        if self._fingerprints is None:
+            return
+
+        for record in self._fingerprints.get_held_records():
+            super()._write_record_message(record)
+
+        # listings of streams without a replication key are complete, so missing
+        # records were deleted rather than outside of the extracted range
+        if self.config["emit_tombstones"] and not self.replication_key:
+            deleted_at = datetime.now(tz=timezone.utc).isoformat()
+
+            for keys in self._fingerprints.get_missing():
+                super()._write_record_message(keys | {"_sdc_deleted_at": deleted_at})
+
+        # only once the records and tombstones are written, so fingerprints are
+        # written to the target in the same state message as the bookmark
+        self._fingerprints.commit()
+
+    @override
+    def request_records(self, context):
+        if not self.config["fetch_queue_pages"]:
+            yield from super().request_records(context)
+            return
+
+        pipeline = FetchPipeline(
+            max_pages=self.config["fetch_queue_pages"],
+            max_bytes=self.config["fetch_queue_bytes"],
+        )
+
+        try:
+            for response in pipeline.iter_pages(self._request_pages(context)):
+                yield from self.parse_response(response)
+        finally:
+            self._write_pipeline_metrics(pipeline, context)
+
+    def request_total_count(self, context) -> int:
+        """Request the first page of records to get the total number of records.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The total number of records.
+        """
+        paginator = self.get_new_paginator() or SinglePagePaginator()
+        prepared_request = self._prepare_request(context=context, page=paginator)
+        response = self.request_decorator(self._request)(prepared_request, context)
+
+        return response.json()["totalCount"]
+
+    def _request_pages(self, context):
+        # as `RESTStream.request_records`, without parsing responses
+        paginator = self.get_new_paginator() or SinglePagePaginator()
+        decorated_request = self.request_decorator(self._request)
+
+        with self.get_http_request_counter() as request_counter:
+            request_counter.with_context(context)
+
+            while not paginator.finished:
+                prepared_request = self._prepare_request(
+                    context=context,
+                    page=paginator,
+                )
+                response = decorated_request(prepared_request, context)
+                request_counter.increment()
+                self.update_sync_costs(prepared_request, response, context)
+
+                yield response
+
+                paginator.advance(response)
+
+    def _write_pipeline_metrics(self, pipeline: FetchPipeline, context):
+        tags: dict[str, t.Any] = {
+            metrics.Tag.STREAM: self.name,
+            metrics.Tag.ENDPOINT: self.path,
+        }
+
+        if context:
+            tags[metrics.Tag.CONTEXT] = context
+
+        points = (
+            ("gauge", PipelineMetric.FETCH_QUEUE_DEPTH, pipeline.max_depth),
+            ("gauge", PipelineMetric.FETCH_QUEUE_BYTES, pipeline.max_depth_bytes),
+            ("timer", PipelineMetric.FETCH_STALL_DURATION, pipeline.stall_duration),
+        )
+
+        for metric_type, metric, value in points:
+            # points are typed for SDK metrics only, but log any metric name
+            point = metrics.Point(
+                metric_type,
+                t.cast("metrics.Metric", metric),
+                value,
+                tags,
+            )
+            metrics.log(self.metrics_logger, point)
+
+    @override
+    def _write_record_message(self, record):
+        if self.deduplicate and self._seen_records.add(
+            json.dumps(record, sort_keys=True, default=str).encode()
+        ):
+            self._duplicate_count += 1
+            return
+
+        if self._is_unchanged(record):
+            return
+
+        super()._write_record_message(record)
+
+    def _get_fingerprints(self, context):
+        return RecordFingerprints(self.get_context_state(context), self.primary_keys)
+
+    def _is_unchanged(self, record):
+        return self._fingerprints is not None and not self._fingerprints.update(record)
+
     @override
     def backoff_wait_generator(self):
         def _backoff_from_headers(retriable_api_error: RetriableAPIError):
@@ -40,6 +215,46 @@ class OutbrainStream(RESTStream):
     def backoff_max_tries(self):
         return 8
 
+    @override
+    def backoff_handler(self, details):
+        if not _is_rate_limited(details["exception"]):
+            self._tap.retry_budget.consume()
+
+        super().backoff_handler(details)
+
+    @override
+    def request_decorator(self, func):
+        circuit_breaker = self._tap.circuit_breaker
+
+        @functools.wraps(func)
+        def _attempt(prepared_request, context):
+            # fail fast, including between retries, once the endpoint is unhealthy
+            circuit_breaker.check(self.path)
+            return func(prepared_request, context)
+
+        retrying_request = super().request_decorator(_attempt)
+
+        @functools.wraps(func)
+        def _request(prepared_request, context):
+            # one outcome per request rather than per attempt, so that retries of a
+            # single failing partition do not open the circuit on their own
+            try:
+                response = retrying_request(prepared_request, context)
+            except (
+                ConnectionResetError,
+                RetriableAPIError,
+                RetryBudgetExhaustedError,
+                requests.exceptions.RequestException,
+            ) as e:
+                if not _is_rate_limited(e):
+                    circuit_breaker.record(self.path, success=False)
+                raise
+
+            circuit_breaker.record(self.path, success=True)
+            return response
+
+        return _request
+
     @override
     def backoff_runtime(self, *, value):
         exception = yield
@@ -59,3 +274,90 @@ class OutbrainStream(RESTStream):
     def include_archived(self):
         """Whether or not to include archived data."""
         return self.name in self.config["include_archived"]
+
+    @cached_property
+    def changed_only(self):
+        """Whether or not to only emit new or changed records."""
+        return self.name in self.config["changed_only"]
+
+    @cached_property
+    def deduplicate(self):
+        """Whether or not to suppress exact duplicate records within a run."""
+        return self.name in self.config["deduplicate"]
+
+    @cached_property
+    def _seen_records(self):
+        return BloomFilter(self.config["deduplicate_capacity"])
+
+    @property
+    def campaign_index(self):
+        """Local marketer/campaign index shared by all streams."""
+        return self._tap.campaign_index
+
+    @property
+    def scheduler(self):
+        """Priority scheduler shared by all streams."""
+        return self._tap.scheduler
+
+    @cached_property
+    def campaign_index_ttl(self):
+        """Maximum age of a fresh campaign index entry."""
+        return timedelta(minutes=self.config["campaign_index_ttl"])
+
+
+def _is_rate_limited(exception: BaseException):
+    return (
+        isinstance(exception, RetriableAPIError)
+        and exception.response is not None
+        and exception.response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+class OutbrainReportStream(OutbrainStream):
+    """Outbrain report stream class."""
+
+    @override
+    @cached_property
+    def changed_only(self):
+        # re-extracted rows are only emitted if their metrics changed
+        return (
+            self.attribution_lookback > timedelta(0)
+            or self.name in self.config["changed_only"]
+        )
+
+    @override
+    def _get_fingerprints(self, context):
+        starting_date = self.get_starting_timestamp(context)
+
+        # rows from the bookmark on are always written, so that only rows re-extracted
+        # for the attribution lookback are suppressed
+        return DateFingerprints(
+            self.get_context_state(context),
+            self.replication_key,
+            since=starting_date.date().isoformat() if starting_date else None,
+        )
+
+    @cached_property
+    def attribution_lookback(self):
+        """Period before the bookmark to re-extract report data for."""
+        return timedelta(days=self.config["attribution_lookback_days"])
+
+    def get_report_start_date(self, context):
+        """Get the date to extract report data from.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The bookmark date less the attribution lookback, or the start date if
+            more recent.
+        """
+        starting_date = self.get_starting_timestamp(context)
+        start_date = self._parse_datetime(self.config["start_date"])
+
+        if starting_date is None:
+            # partition not syncing yet, so fall back to its bookmark
+            bookmark = self.get_context_state(context).get("replication_key_value")
+            starting_date = self._parse_datetime(bookmark) if bookmark else start_date
+
+        return max(starting_date - self.attribution_lookback, start_date).date()
@@ -0,0 +1,70 @@
+"""In-run record deduplication for tap-outbrain."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+
+# probability of a record being mistaken for a duplicate, while within capacity
+ERROR_RATE = 1e-9
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of byte strings.
+
+    Memory is allocated up front for the given capacity, and never grows: once
+    capacity is reached, the filter is cleared so the error rate stays bounded, at
+    the cost of forgetting the items added so far.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = ERROR_RATE) -> None:
+        """Initialise the filter.
+
+        Args:
+            capacity: Number of items to hold before clearing.
+            error_rate: False positive probability while within capacity.
+
+        Raises:
+            ValueError: If capacity is less than 1.
+        """
+        if capacity < 1:
+            msg = f"Capacity must be at least 1, got {capacity}"
+            raise ValueError(msg)
+
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def add(self, item: bytes) -> bool:
+        """Add an item to the filter.
+
+        Args:
+            item: Item to add.
+
+        Returns:
+            `True` if the item was (probably) already added, otherwise `False`.
+        """
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+
+        positions = [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+        if all(self._bits[p >> 3] & (1 << (p & 7)) for p in positions):
+            return True
+
+        if self.count >= self.capacity:
+            self.clear()
+
+        for p in positions:
+            self._bits[p >> 3] |= 1 << (p & 7)
+
+        self.count += 1
+        return False
+
+    def clear(self) -> None:
+        """Remove all items from the filter."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
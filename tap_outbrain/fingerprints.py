@@ -0,0 +1,151 @@
+"""Record fingerprints for tap-outbrain."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+STATE_KEY = "fingerprints"
+
+
+class RecordFingerprints:
+    """Record content hashes by primary key, kept in stream partition state.
+
+    Fingerprints of the records seen in a sync of a partition only replace those in
+    state once the sync is committed, so that they are written to the target with (and
+    roll back with) the bookmark of the partition, rather than ahead of the records
+    they describe.
+    """
+
+    def __init__(self, state: dict, primary_keys: Sequence[str]) -> None:
+        """Initialise the fingerprints.
+
+        Args:
+            state: Stream partition state.
+            primary_keys: Stream primary keys.
+        """
+        self.state = state
+        self.primary_keys = primary_keys
+        self._previous: dict[str, str] = state.get(STATE_KEY, {})
+        self._current: dict[str, str] = {}
+
+    def update(self, record: dict) -> bool:
+        """Fingerprint a record.
+
+        Args:
+            record: Record to fingerprint.
+
+        Returns:
+            `True` if the record is new or changed, otherwise `False`.
+        """
+        key = json.dumps([record.get(k) for k in self.primary_keys])
+        fingerprint = _fingerprint(record).hex()
+
+        self._current[key] = fingerprint
+        return self._previous.get(key) != fingerprint
+
+    def get_held_records(self) -> list[dict]:
+        """Get records held back by `update` that are new or changed.
+
+        Returns:
+            No records, as records are never held back.
+        """
+        return []
+
+    def get_missing(self) -> list[dict]:
+        """Get records fingerprinted previously but not since.
+
+        Returns:
+            Primary key values of each missing record.
+        """
+        return [
+            dict(zip(self.primary_keys, json.loads(k), strict=True))
+            for k in self._previous.keys() - self._current.keys()
+        ]
+
+    def commit(self) -> None:
+        """Replace the fingerprints in state with those seen since."""
+        self.state[STATE_KEY] = self._current
+
+
+class DateFingerprints:
+    """Digests of the records of each date, kept in stream partition state.
+
+    Report streams re-extract every row of the attribution lookback on each run, so a
+    fingerprint per row would grow state with the number of rows. A single digest of
+    the records of each extracted date is kept instead, and records before the
+    bookmark are held back until all records of their date are seen so that the
+    records of a date are only written again if any of them changed.
+    """
+
+    def __init__(self, state: dict, date_key: str, since: str | None) -> None:
+        """Initialise the fingerprints.
+
+        Args:
+            state: Stream partition state.
+            date_key: Record date property.
+            since: Bookmark date, from which records are always written.
+        """
+        self.state = state
+        self.date_key = date_key
+        self.since = since
+        self._previous: dict[str, str] = state.get(STATE_KEY, {})
+        self._current: defaultdict[str, list[bytes]] = defaultdict(list)
+        self._held_records: list[dict] = []
+
+    def update(self, record: dict) -> bool:
+        """Fingerprint a record.
+
+        Args:
+            record: Record to fingerprint.
+
+        Returns:
+            `True` if the record is from the bookmark date onwards, otherwise `False`
+            as it is held back.
+        """
+        date = record[self.date_key]
+        self._current[date].append(_fingerprint(record))
+
+        if self.since is None or date >= self.since:
+            return True
+
+        self._held_records.append(record)
+        return False
+
+    def get_held_records(self) -> list[dict]:
+        """Get records held back by `update` from dates with new or changed records.
+
+        Returns:
+            Held records from changed dates.
+        """
+        digests = self._get_digests()
+
+        return [
+            record
+            for record in self._held_records
+            if self._previous.get(date := record[self.date_key]) != digests[date]
+        ]
+
+    def commit(self) -> None:
+        """Replace the digests in state with those of the dates seen since."""
+        self.state[STATE_KEY] = self._get_digests()
+
+    def _get_digests(self):
+        return {
+            date: hashlib.blake2b(
+                b"".join(sorted(fingerprints)), digest_size=8
+            ).hexdigest()
+            for date, fingerprints in self._current.items()
+        }
+
+
+def _fingerprint(record: dict):
+    return hashlib.blake2b(
+        json.dumps(record, sort_keys=True, default=str).encode(),
+        digest_size=8,
+    ).digest()
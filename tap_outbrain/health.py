@@ -0,0 +1,150 @@
+"""Endpoint health tracking for tap-outbrain."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+from singer_sdk.exceptions import FatalAPIError
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+
+class EndpointUnavailableError(FatalAPIError):
+    """Request was not attempted as the endpoint is unhealthy."""
+
+
+class RetryBudgetExhaustedError(FatalAPIError):
+    """Request was not retried as the retry budget for the run is exhausted."""
+
+
+class _EndpointState:
+    def __init__(self, window: int) -> None:
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.opened_at: float | None = None
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    An endpoint is considered unhealthy (open) once the failure rate of its recent
+    requests reaches a threshold. Requests fail fast while open, until a cooldown
+    has elapsed and a trial request is allowed through: the endpoint is considered
+    healthy (closed) again if it succeeds, otherwise it remains open.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float,
+        cooldown: timedelta,
+        window: int = 20,
+        min_requests: int = 5,
+    ) -> None:
+        """Initialise the circuit breaker.
+
+        Args:
+            threshold: Failure rate at which an endpoint is considered unhealthy.
+            cooldown: Time to wait before retrying an unhealthy endpoint.
+            window: Number of recent requests to calculate the failure rate from.
+            min_requests: Minimum number of recent requests to calculate the failure
+                rate from.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown.total_seconds()
+        self.window = window
+        self.min_requests = min_requests
+        self._endpoints: dict[str, _EndpointState] = {}
+
+    def check(self, endpoint: str) -> None:
+        """Check an endpoint is available to request.
+
+        Args:
+            endpoint: Endpoint path.
+
+        Raises:
+            EndpointUnavailableError: If the endpoint is unhealthy.
+        """
+        state = self._get_state(endpoint)
+
+        if state.opened_at is None:
+            return
+
+        remaining = state.opened_at + self.cooldown - time.monotonic()
+
+        if remaining > 0:
+            msg = f"Endpoint '{endpoint}' is unhealthy (retry in {remaining:.0f}s)"
+            raise EndpointUnavailableError(msg)
+
+    def record(self, endpoint: str, *, success: bool) -> None:
+        """Record the outcome of a request to an endpoint.
+
+        Args:
+            endpoint: Endpoint path.
+            success: Whether or not the request succeeded.
+        """
+        state = self._get_state(endpoint)
+
+        if state.opened_at is not None:
+            # trial request after cooldown
+            if success:
+                state.opened_at = None
+                state.outcomes.clear()
+            else:
+                state.opened_at = time.monotonic()
+
+            return
+
+        state.outcomes.append(success)
+
+        if len(state.outcomes) < self.min_requests:
+            return
+
+        failure_rate = state.outcomes.count(False) / len(state.outcomes)
+
+        if failure_rate >= self.threshold:
+            state.opened_at = time.monotonic()
+
+    def get_failure_rates(self) -> dict[str, float]:
+        """Get the recent failure rate of each requested endpoint.
+
+        Returns:
+            Failure rates by endpoint path.
+        """
+        return {
+            endpoint: state.outcomes.count(False) / len(state.outcomes)
+            for endpoint, state in self._endpoints.items()
+            if state.outcomes
+        }
+
+    def _get_state(self, endpoint: str):
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = _EndpointState(self.window)
+
+        return self._endpoints[endpoint]
+
+
+class RetryBudget:
+    """Retry budget shared across all requests of a run."""
+
+    def __init__(self, retries: int) -> None:
+        """Initialise the retry budget.
+
+        Args:
+            retries: Number of retries allowed.
+        """
+        self.remaining = retries
+
+    def consume(self) -> None:
+        """Consume a retry.
+
+        Raises:
+            RetryBudgetExhaustedError: If no retries remain.
+        """
+        if self.remaining <= 0:
+            msg = "Retry budget exhausted"
+            raise RetryBudgetExhaustedError(msg)
+
+        self.remaining -= 1
@@ -0,0 +1,226 @@
+"""Local campaign index for tap-outbrain."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+
+class CampaignIndex:
+    """Persisted index of marketer and campaign contexts.
+
+    Stores the marketer IDs and, per marketer, the last-seen `lastModified` and
+    status of each campaign so child streams can be driven without re-listing
+    parent streams on every run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Load the index from disk, if it exists.
+
+        Args:
+            path: Index file path.
+        """
+        self.path = path
+
+        try:
+            self._data: dict = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._data = {}
+
+        self._data.setdefault("marketers", {})
+
+        for marketer in self._data["marketers"].values():
+            marketer["campaigns"] = {
+                campaign_id: _IndexedCampaign(**campaign)
+                for campaign_id, campaign in marketer.get("campaigns", {}).items()
+            }
+
+    @staticmethod
+    def is_fresh(refreshed: datetime | None, ttl: timedelta) -> bool:
+        """Whether or not an index entry refreshed at a given time is still fresh.
+
+        Args:
+            refreshed: When the index entry was last refreshed.
+            ttl: Maximum age of a fresh index entry.
+
+        Returns:
+            `True` if the entry is fresh, otherwise `False`.
+        """
+        if refreshed is None:
+            return False
+
+        return datetime.now(tz=timezone.utc) - refreshed < ttl
+
+    @property
+    def marketers_refreshed(self) -> datetime | None:
+        """When the marketers were last refreshed."""
+        return _parse_datetime(self._data.get("refreshed"))
+
+    @property
+    def marketer_ids(self) -> list[str]:
+        """Indexed marketer IDs."""
+        return list(self._data["marketers"])
+
+    def update_marketers(self, marketer_ids: Iterable[str], refreshed: datetime):
+        """Replace the indexed marketers, keeping campaigns of retained marketers.
+
+        Args:
+            marketer_ids: Marketer IDs.
+            refreshed: When the marketers were listed.
+        """
+        marketers: dict = self._data["marketers"]
+
+        self._data["refreshed"] = refreshed.isoformat()
+        self._data["marketers"] = {
+            marketer_id: marketers.get(marketer_id, {}) for marketer_id in marketer_ids
+        }
+
+    def get_campaigns_refreshed(
+        self,
+        marketer_id: str,
+        *,
+        include_archived: bool,
+        start_date: datetime,
+        max_age: timedelta,
+    ) -> datetime | None:
+        """Get when the campaigns of a marketer were last refreshed.
+
+        Args:
+            marketer_id: Marketer ID.
+            include_archived: Whether or not archived campaigns are required.
+            start_date: Earliest last modified date of campaigns required.
+            max_age: Maximum age of the listing the campaigns were first indexed
+                from, as incremental refreshes do not remove campaigns that were
+                archived or deleted since.
+
+        Returns:
+            When the campaigns were last refreshed, or `None` if they have not been
+            indexed with a compatible `include_archived` value, from a last
+            modified date before the start date, or are due to be listed again.
+        """
+        marketer = self._data["marketers"].get(marketer_id, {})
+
+        if marketer.get("includeArchived") != include_archived:
+            return None
+
+        # entries indexed before the listing lower bound was recorded are unknown
+        if "since" not in marketer or "listed" not in marketer:
+            return None
+
+        if not self.is_fresh(_parse_datetime(marketer["listed"]), max_age):
+            return None
+
+        since = _parse_datetime(marketer["since"])
+
+        if since is not None and start_date < since:
+            return None
+
+        return _parse_datetime(marketer.get("refreshed"))
+
+    def clear_campaigns(self, marketer_id: str) -> None:
+        """Remove all indexed campaigns of a marketer.
+
+        Args:
+            marketer_id: Marketer ID.
+        """
+        self._data["marketers"][marketer_id] = {}
+
+    def update_campaign(self, marketer_id: str, record: dict) -> None:
+        """Index a campaign record.
+
+        Args:
+            marketer_id: Marketer ID.
+            record: Campaign record.
+        """
+        marketer: dict = self._data["marketers"].setdefault(marketer_id, {})
+        campaigns: dict = marketer.setdefault("campaigns", {})
+
+        campaigns[record["id"]] = _IndexedCampaign(
+            lastModified=record.get("lastModified"),
+            enabled=record.get("enabled"),
+            onAir=(record.get("liveStatus") or {}).get("campaignOnAir"),
+        )
+
+    def mark_campaigns_refreshed(
+        self,
+        marketer_id: str,
+        refreshed: datetime,
+        *,
+        include_archived: bool,
+        since: datetime | None,
+    ) -> None:
+        """Mark the campaigns of a marketer as refreshed.
+
+        Args:
+            marketer_id: Marketer ID.
+            refreshed: When the campaigns were listed.
+            include_archived: Whether or not archived campaigns were listed.
+            since: Last modified date campaigns were listed from, or `None` if all
+                campaigns were listed. Only recorded for the first refresh since the
+                campaigns were cleared, as later refreshes extend the same listing.
+        """
+        marketer: dict = self._data["marketers"].setdefault(marketer_id, {})
+        marketer.setdefault("campaigns", {})
+
+        if "refreshed" not in marketer:
+            marketer["since"] = since.isoformat() if since else None
+            marketer["listed"] = refreshed.isoformat()
+
+        marketer["refreshed"] = refreshed.isoformat()
+        marketer["includeArchived"] = include_archived
+
+    def get_campaigns(self, marketer_id: str) -> Iterator[dict]:
+        """Get partial campaign records of a marketer from the index.
+
+        Args:
+            marketer_id: Marketer ID.
+
+        Yields:
+            Campaign records with the indexed properties only.
+        """
+        marketer: dict = self._data["marketers"].get(marketer_id, {})
+
+        for campaign_id, campaign in marketer.get("campaigns", {}).items():
+            yield {
+                "id": campaign_id,
+                "marketerId": marketer_id,
+                "lastModified": campaign.lastModified,
+                "enabled": campaign.enabled,
+                "liveStatus": {"campaignOnAir": campaign.onAir},
+            }
+
+    def save(self) -> None:
+        """Write the index to disk."""
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._data, default=_IndexedCampaign.to_dict))
+        tmp_path.replace(self.path)
+
+
+class _IndexedCampaign:
+    __slots__ = ("enabled", "lastModified", "onAir")
+
+    def __init__(
+        self,
+        lastModified: str | None,  # noqa: N803
+        enabled: bool | None,  # noqa: FBT001
+        onAir: bool | None,  # noqa: FBT001, N803
+    ) -> None:
+        self.lastModified = lastModified
+        self.enabled = enabled
+        self.onAir = onAir
+
+    def to_dict(self):
+        return {
+            "lastModified": self.lastModified,
+            "enabled": self.enabled,
+            "onAir": self.onAir,
+        }
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
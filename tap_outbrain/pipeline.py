@@ -0,0 +1,140 @@
+"""Bounded fetch pipeline for tap-outbrain."""
+
+from __future__ import annotations
+
+import enum
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import requests
+
+
+class PipelineMetric(str, enum.Enum):
+    """Fetch pipeline metric names."""
+
+    FETCH_QUEUE_DEPTH = "fetch_queue_depth"
+    FETCH_QUEUE_BYTES = "fetch_queue_bytes"
+    FETCH_STALL_DURATION = "fetch_stall_duration"
+
+
+class FetchPipeline:
+    """Fetches pages on a background thread ahead of their records being emitted.
+
+    Fetched pages are held in a queue bounded by both page count and size. Fetching
+    pauses while either bound is reached, until enough pages have been consumed
+    (backpressure), so a slow consumer cannot cause fetched pages to accumulate in
+    memory. A single page larger than the size bound is still queued on its own.
+    """
+
+    def __init__(self, *, max_pages: int, max_bytes: int) -> None:
+        """Initialise the pipeline.
+
+        Args:
+            max_pages: Maximum number of fetched pages to queue.
+            max_bytes: Maximum total size of fetched pages to queue, in bytes.
+        """
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_depth = 0
+        self.max_depth_bytes = 0
+        self.stall_duration = 0.0
+        self._queue: deque[tuple[requests.Response, int]] = deque()
+        self._queue_bytes = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._done = False
+        self._error: BaseException | None = None
+
+    def iter_pages(
+        self, pages: Iterator[requests.Response]
+    ) -> Iterator[requests.Response]:
+        """Fetch pages in the background, in order.
+
+        Args:
+            pages: Iterator of pages, fetching each page as it is advanced.
+
+        Yields:
+            Fetched pages.
+
+        Raises:
+            BaseException: Any error raised fetching pages, once all pages fetched
+                before it have been yielded.
+        """
+        producer = threading.Thread(
+            target=self._produce,
+            args=(pages,),
+            name="fetch-pipeline",
+            daemon=True,
+        )
+        producer.start()
+
+        try:
+            while True:
+                with self._condition:
+                    while not (self._queue or self._done):
+                        self._condition.wait()
+
+                    if not self._queue:
+                        if self._error:
+                            raise self._error
+
+                        return
+
+                    page, size = self._queue.popleft()
+                    self._queue_bytes -= size
+                    self._condition.notify_all()
+
+                yield page
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
+            producer.join()
+
+    def _produce(self, pages: Iterator[requests.Response]):
+        try:
+            for page in pages:
+                size = len(page.content)
+
+                with self._condition:
+                    stalled = time.monotonic()
+
+                    while not self._closed and self._is_full(size):
+                        self._condition.wait()
+
+                    self.stall_duration += time.monotonic() - stalled
+
+                    if self._closed:
+                        return
+
+                    self._queue.append((page, size))
+                    self._queue_bytes += size
+                    self.max_depth = max(self.max_depth, len(self._queue))
+                    self.max_depth_bytes = max(self.max_depth_bytes, self._queue_bytes)
+                    self._condition.notify_all()
+        except BaseException as e:  # noqa: BLE001
+            self._error = e
+        finally:
+            close = getattr(pages, "close", None)
+
+            if close:
+                close()
+
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def _is_full(self, size: int):
+        if not self._queue:
+            return False
+
+        return (
+            len(self._queue) >= self.max_pages
+            or self._queue_bytes + size > self.max_bytes
+        )
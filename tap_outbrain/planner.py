@@ -0,0 +1,199 @@
+"""Dry-run request planner for tap-outbrain."""
+
+from __future__ import annotations
+
+import math
+import time
+import typing as t
+from datetime import datetime, timedelta, timezone
+
+from tap_outbrain.client import OutbrainReportStream
+
+if t.TYPE_CHECKING:
+    from singer_sdk.streams import Stream
+
+    from tap_outbrain.client import OutbrainStream
+    from tap_outbrain.streams import CampaignStream, MarketerStream
+    from tap_outbrain.tap import TapOutbrain
+
+# number of campaigns to request promoted link counts for
+SAMPLE_SIZE = 25
+
+
+class RequestPlanner:
+    """Estimates the requests and duration of a sync, without syncing.
+
+    Marketers and campaigns are listed (or served from a fresh campaign index) to
+    determine the partitions of each selected stream. Pages per partition are
+    estimated from bookmarks, page sizes and the total counts of a sample of
+    campaigns. The duration is estimated from the observed time per request, or from
+    the configured request rate limit if that would take longer. No report data is
+    requested.
+    """
+
+    def __init__(self, tap: TapOutbrain) -> None:
+        """Initialise the planner.
+
+        Args:
+            tap: Tap instance to plan a sync of.
+        """
+        self.tap = tap
+        self.requests = 0
+        self.elapsed = 0.0
+        self._plans: dict[str, dict] = {}
+
+    def plan(self) -> dict:
+        """Plan a sync.
+
+        Returns:
+            Partitions, date windows and pages per stream, and the estimated number
+            of requests and duration of the sync, with whether the duration is bound by
+            request latency or the rate limit.
+        """
+        marketers = t.cast("MarketerStream", self.tap.streams["marketers"])
+        campaigns = t.cast("CampaignStream", self.tap.streams["campaigns"])
+        campaign_streams = [
+            t.cast("OutbrainStream", s) for s in campaigns.child_streams if s.selected
+        ]
+
+        marketer_ids = self._get_marketer_ids(marketers)
+
+        for child_stream in marketers.child_streams:
+            if child_stream.selected and child_stream is not campaigns:
+                self._add(
+                    child_stream,
+                    partitions=len(marketer_ids),
+                    pages=len(marketer_ids),
+                )
+
+        if campaigns.selected or campaign_streams:
+            contexts = [
+                context
+                for marketer_id in marketer_ids
+                for context in self._get_campaign_contexts(campaigns, marketer_id)
+            ]
+
+            for child_stream in campaign_streams:
+                self._plan_campaign_stream(child_stream, contexts)
+
+        total = sum(p["pages"] for p in self._plans.values())
+        seconds_per_request = self.elapsed / self.requests if self.requests else None
+        requests_per_minute: int | None = self.tap.config.get("requests_per_minute")
+        durations: dict[str, float] = {}
+
+        if seconds_per_request is not None:
+            durations["latency"] = total * seconds_per_request
+
+        if requests_per_minute:
+            durations["rate_limit"] = total / requests_per_minute * 60
+
+        bound = max(durations, key=durations.__getitem__) if durations else None
+
+        return {
+            "streams": self._plans,
+            "requests": total,
+            "plan_requests": self.requests,
+            "seconds_per_request": seconds_per_request,
+            "requests_per_minute": requests_per_minute,
+            "estimated_duration": (
+                str(timedelta(seconds=round(durations[bound]))) if bound else None
+            ),
+            "estimated_duration_bound": bound,
+        }
+
+    def _get_marketer_ids(self, marketers: MarketerStream):
+        index = self.tap.campaign_index
+        fresh = index.is_fresh(index.marketers_refreshed, marketers.campaign_index_ttl)
+
+        if not marketers.selected and fresh:
+            self._add(marketers, partitions=1, pages=0)
+            return index.marketer_ids
+
+        records = self._list(marketers, None)
+        self._add(marketers, partitions=1, pages=1)
+        self.requests += 1
+
+        return [r["id"] for r in records]
+
+    def _get_campaign_contexts(self, campaigns: CampaignStream, marketer_id: str):
+        index = self.tap.campaign_index
+        context = {"marketerId": marketer_id}
+        refreshed = campaigns.get_index_refreshed(marketer_id)
+
+        if not campaigns.selected and index.is_fresh(
+            refreshed,
+            campaigns.campaign_index_ttl,
+        ):
+            records = list(index.get_campaigns(marketer_id))
+            self._add(campaigns, partitions=1, pages=0)
+        else:
+            # unselected campaigns are listed since the index was last refreshed
+            listed = self._list(campaigns, context)
+            indexed = index.get_campaigns(marketer_id) if refreshed else ()
+            records = list({r["id"]: r for r in (*indexed, *listed)}.values())
+
+            pages = max(1, math.ceil(len(listed) / campaigns._page_size))  # noqa: SLF001
+            self._add(campaigns, partitions=1, pages=pages)
+            self.requests += pages
+
+        return [
+            campaigns.get_child_context(record, context)
+            for record in records
+            if campaigns.stream_maps[0].get_filter_result(record)
+        ]
+
+    def _plan_campaign_stream(self, stream: OutbrainStream, contexts: list[dict]):
+        if not contexts:
+            self._add(stream, partitions=0, pages=0)
+            return
+
+        if not isinstance(stream, OutbrainReportStream):
+            sample = contexts[:: math.ceil(len(contexts) / SAMPLE_SIZE)]
+            counts = [self._request_total_count(stream, c) for c in sample]
+            self.requests += len(sample)
+            page_size = stream._page_size  # noqa: SLF001
+            pages = max(1, math.ceil(sum(counts) / len(counts) / page_size))
+
+            self._add(stream, partitions=len(contexts), pages=pages * len(contexts))
+            return
+
+        today = datetime.now(tz=timezone.utc).date()
+        start_dates = {
+            c["campaignId"]: stream.get_report_start_date(c) for c in contexts
+        }
+        days = {k: (today - v).days + 1 for k, v in start_dates.items()}
+
+        page_size = stream._page_size  # noqa: SLF001
+        pages = sum(math.ceil(d / page_size) for d in days.values())
+
+        self._add(stream, partitions=len(contexts), pages=pages)
+        self._plans[stream.name].update(
+            {
+                "days": sum(days.values()),
+                "from": min(start_dates.values()).isoformat(),
+                "to": today.isoformat(),
+            }
+        )
+
+    def _list(self, stream: OutbrainStream, context: dict | None):
+        started = time.monotonic()
+        records = list(stream.request_records(context))
+        self.elapsed += time.monotonic() - started
+
+        return records
+
+    def _request_total_count(self, stream: OutbrainStream, context: dict):
+        started = time.monotonic()
+        total_count = stream.request_total_count(context)
+        self.elapsed += time.monotonic() - started
+
+        return total_count
+
+    def _add(self, stream: Stream, *, partitions: int, pages: int):
+        plan = self._plans.setdefault(
+            stream.name,
+            {"selected": stream.selected, "partitions": 0, "pages": 0},
+        )
+
+        plan["partitions"] += partitions
+        plan["pages"] += pages
@@ -0,0 +1,65 @@
+"""Sync profiling for tap-outbrain."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class StreamProfiler:
+    """Profiles stream syncs, with a profile per stream.
+
+    Profiles accumulate over all partitions of a stream. Streams synced while another
+    stream is syncing (i.e. child streams) pause the profile of the other stream, so
+    time is only attributed to the innermost stream. Profiles are written in `pstats`
+    format whenever no stream is syncing, to view with e.g. `snakeviz`, or convert to
+    a flamegraph with e.g. `flameprof`. Work done on other threads is not profiled.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialise the profiler.
+
+        Args:
+            path: Directory to write profiles to.
+        """
+        self.path = path
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._active: list[cProfile.Profile] = []
+
+    @contextlib.contextmanager
+    def profile(self, stream_name: str) -> Iterator[None]:
+        """Profile a stream sync within the context.
+
+        Args:
+            stream_name: Stream name.
+        """
+        profile = self._profiles.setdefault(stream_name, cProfile.Profile())
+
+        if self._active:
+            self._active[-1].disable()
+
+        self._active.append(profile)
+        profile.enable()
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._active.pop()
+
+            if self._active:
+                self._active[-1].enable()
+            else:
+                self.save()
+
+    def save(self) -> None:
+        """Write the profile of each stream to disk."""
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        for stream_name, profile in self._profiles.items():
+            profile.dump_stats(self.path / f"{stream_name}.prof")
@@ -0,0 +1,186 @@
+"""Priority scheduler for tap-outbrain."""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import requests
+from singer_sdk.exceptions import (
+    AbortedSyncFailedException,
+    AbortedSyncPausedException,
+    RetriableAPIError,
+)
+
+from tap_outbrain.health import EndpointUnavailableError, RetryBudgetExhaustedError
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from singer_sdk.streams import Stream
+
+    from tap_outbrain.state import CoalescingStateWriter
+
+# partitions with no more than this many days to sync are considered fresh
+FRESH_DAYS = 2
+
+
+class PriorityScheduler:
+    """Schedules child stream partitions to sync in priority order.
+
+    Partitions are synced:
+    1. deferred by the previous run before others
+    2. live campaigns before others
+    3. fresh partitions before backfills
+    4. higher stream weight before lower
+    5. fewest days to sync before most
+
+    Partitions that fail due to an unhealthy endpoint or exhausted retries are
+    deferred rather than failing the sync, and written to a report for the next run.
+    """
+
+    def __init__(
+        self,
+        weights: Mapping[str, float],
+        report_path: Path,
+        state_writer: CoalescingStateWriter,
+        logger: logging.Logger,
+    ) -> None:
+        """Initialise the scheduler.
+
+        Args:
+            weights: Stream weights by name, defaulting to 1.
+            report_path: Deferred partitions report file path.
+            state_writer: State writer to coalesce partition state writes with.
+            logger: Logger instance.
+        """
+        self.weights = weights
+        self.report_path = report_path
+        self.state_writer = state_writer
+        self.logger = logger
+        self.deferred: list[dict] = []
+        self._queue: list[_Partition] = []
+        self._counter = itertools.count()
+
+        try:
+            report: list[dict] = json.loads(report_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            report = []
+
+        self._previously_deferred = {
+            _partition_key(p["stream"], p["context"]): p for p in report
+        }
+
+    def schedule(self, stream: Stream, context: dict, *, live: bool) -> None:
+        """Schedule a stream partition to sync.
+
+        Args:
+            stream: Stream to sync.
+            context: Stream partition context.
+            live: Whether or not the partition is for a live campaign.
+        """
+        pending_days = self._get_pending_days(stream, context)
+        priority = (
+            _partition_key(stream.name, context) not in self._previously_deferred,
+            not live,
+            pending_days > FRESH_DAYS,
+            -self.weights.get(stream.name, 1),
+            pending_days,
+            next(self._counter),  # preserve scheduling order otherwise
+        )
+
+        self._queue.append(_Partition(priority, stream, context))
+
+    def run(self) -> None:
+        """Sync all scheduled stream partitions in priority order."""
+        queue = sorted(self._queue, key=lambda p: p.priority, reverse=True)
+        self._queue.clear()
+
+        with self.state_writer.coalesce():
+            while queue:
+                partition = queue.pop()
+                stream, context = partition.stream, partition.context
+                self._previously_deferred.pop(
+                    _partition_key(stream.name, context),
+                    None,
+                )
+
+                try:
+                    stream.sync(context=copy.copy(context))
+                except (AbortedSyncFailedException, AbortedSyncPausedException):
+                    # stream was interrupted, continue with remaining partitions
+                    continue
+                except (
+                    ConnectionResetError,
+                    EndpointUnavailableError,
+                    RetriableAPIError,
+                    RetryBudgetExhaustedError,
+                    requests.exceptions.RequestException,
+                ) as e:
+                    self._defer(stream, context, e)
+
+        self._write_report()
+
+    def _defer(self, stream: Stream, context: dict, exception: Exception):
+        stream.logger.warning("Deferring partition %s: %s", context, exception)
+
+        # discard any progress so the bookmark is not advanced past missing data
+        stream.get_context_state(context).pop("progress_markers", None)
+
+        self.deferred.append(
+            {
+                "stream": stream.name,
+                "context": dict(context),
+                "reason": str(exception),
+            }
+        )
+
+    def _write_report(self):
+        # keep previously deferred partitions that were not attempted this run
+        report = self.deferred + list(self._previously_deferred.values())
+
+        if report:
+            self.logger.warning(
+                "Deferred %d partition(s) to the next run, see report: %s",
+                len(report),
+                self.report_path,
+            )
+
+        self.report_path.write_text(json.dumps(report, indent=2))
+
+    @staticmethod
+    def _get_pending_days(stream: Stream, context: dict) -> int:
+        if not stream.replication_key:
+            return 0
+
+        state = stream.get_context_state(context)
+        values = (state.get("replication_key_value"), stream.config.get("start_date"))
+
+        # most recent of bookmark and start date, as per the SDK
+        starting = max(
+            (stream._parse_datetime(v) for v in values if v),  # noqa: SLF001
+            default=None,
+        )
+
+        if starting is None:
+            return 0
+
+        return (datetime.now(tz=timezone.utc) - starting).days
+
+
+class _Partition:
+    __slots__ = ("context", "priority", "stream")
+
+    def __init__(self, priority: tuple, stream: Stream, context: dict) -> None:
+        self.priority = priority
+        self.stream = stream
+        self.context = context
+
+
+def _partition_key(stream_name: str, context: Mapping):
+    return stream_name, tuple(sorted(context.items()))
@@ -0,0 +1,126 @@
+"""State handling for tap-outbrain."""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from singer_sdk.streams._state import StreamStateManager
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from singer_sdk.helpers import types
+    from singer_sdk.helpers._state import StateWriter
+
+
+class PartitionStateManager(StreamStateManager):
+    """Stream state manager with constant-time partition state lookup.
+
+    The SDK finds partition state by scanning the list of all partitions of a stream,
+    which becomes the bottleneck with tens of thousands of partitions as it happens
+    for every record. Partition state is indexed by context values instead, and
+    context values are interned so that they are shared across partitions.
+    """
+
+    @override
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._partitions: list[dict] | None = None
+        self._partition_index: dict[tuple, dict] = {}
+
+    @override
+    def get_context_state(self, context):
+        state_partition_context = self.get_state_partition_context(context)
+
+        if not state_partition_context:
+            return self.stream_state
+
+        partitions: list[dict] = self.stream_state.setdefault("partitions", [])
+
+        # (re)build index if state was replaced
+        if partitions is not self._partitions:
+            self._partitions = partitions
+            self._partition_index = {}
+
+            for partition in partitions:
+                partition["context"] = _intern_context(partition["context"])
+                self._partition_index[_get_partition_key(partition["context"])] = (
+                    partition
+                )
+
+        key = _get_partition_key(state_partition_context)
+
+        if (partition := self._partition_index.get(key)) is None:
+            partition = {"context": _intern_context(state_partition_context)}
+            partitions.append(partition)
+            self._partition_index[key] = partition
+
+        return partition
+
+
+class CoalescingStateWriter:
+    """State writer that can coalesce frequent writes.
+
+    Each write of the SDK state writer compares and copies the entire tap state, so
+    writing state after every one of tens of thousands of partitions is quadratic.
+    While coalescing, state is written at most once per interval and once more when
+    coalescing ends.
+    """
+
+    def __init__(self, state_writer: StateWriter, interval: float) -> None:
+        """Initialise the state writer.
+
+        Args:
+            state_writer: SDK state writer to write state with.
+            interval: Minimum number of seconds between coalesced writes.
+        """
+        self._state_writer = state_writer
+        self.interval = interval
+        self._coalescing = False
+        self._pending: types.TapState | None = None
+        self._last_written = 0.0
+
+    def write_state(self, state: types.TapState) -> None:
+        """Write a state message, or defer it if coalescing.
+
+        Args:
+            state: Tap state.
+        """
+        if self._coalescing and time.monotonic() - self._last_written < self.interval:
+            self._pending = state
+            return
+
+        self._write_state(state)
+
+    @contextlib.contextmanager
+    def coalesce(self) -> Iterator[None]:
+        """Coalesce state writes within the context."""
+        self._coalescing = True
+
+        try:
+            yield
+        finally:
+            self._coalescing = False
+
+            if self._pending is not None:
+                self._write_state(self._pending)
+
+    def _write_state(self, state: types.TapState):
+        self._state_writer.write_state(state)
+        self._pending = None
+        self._last_written = time.monotonic()
+
+
+def _get_partition_key(context: dict):
+    return tuple(sorted(context.items()))
+
+
+def _intern_context(context: dict):
+    return {
+        sys.intern(k): sys.intern(v) if isinstance(v, str) else v
+        for k, v in context.items()
+    }
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
 
 from singer_sdk import typing as th  # JSON Schema typing helpers
 from typing_extensions import override
 
-from tap_outbrain.client import OutbrainStream
+from tap_outbrain.client import OutbrainReportStream, OutbrainStream
 from tap_outbrain.pagination import OutbrainPaginator, OutbrainResultsPaginator
 
 
@@ -74,6 +75,7 @@ class MarketerStream(OutbrainStream):
         th.Property("role", th.StringType),
         th.Property("permissions", th.ArrayType(th.StringType)),
         th.Property("campaignDefaults", th.ObjectType(additional_properties=True)),
+        th.Property("_sdc_deleted_at", th.DateTimeType),
     ).to_dict()
 
     @override
@@ -83,10 +85,36 @@ class MarketerStream(OutbrainStream):
 
         return params
 
+    @override
+    def get_records(self, context):
+        yield from self._get_marketer_records(context)
+
+        # campaign child streams are deferred until all campaigns are known
+        self.scheduler.run()
+
     @override
     def get_child_context(self, record, context):
         return {"marketerId": record["id"]}
 
+    def _get_marketer_records(self, context):
+        index = self.campaign_index
+        refreshed = index.marketers_refreshed
+
+        if not self.selected and index.is_fresh(refreshed, self.campaign_index_ttl):
+            self.logger.info("Using marketers from index: %s", index.path)
+            yield from ({"id": marketer_id} for marketer_id in index.marketer_ids)
+            return
+
+        refreshed = datetime.now(tz=timezone.utc)
+        marketer_ids = []
+
+        for record in super().get_records(context):
+            marketer_ids.append(record["id"])
+            yield record
+
+        index.update_marketers(marketer_ids, refreshed)
+        index.save()
+
 
 class CampaignStream(OutbrainStream):
     """Define campaign stream."""
@@ -219,7 +247,7 @@ class CampaignStream(OutbrainStream):
         params["sort"] = "+lastModified"
         params["extraFields"] = "CampaignOptimization"
 
-        if starting_last_modified := self.get_starting_timestamp(context):
+        if starting_last_modified := self._get_last_modified_since(context):
             delta = datetime.now(tz=timezone.utc) - starting_last_modified
 
             # API returns data that was last modified up to n+1 days ago
@@ -234,6 +262,52 @@ class CampaignStream(OutbrainStream):
     def check_sorted(self):
         return self._check_sorted
 
+    @override
+    def get_records(self, context):
+        marketer_id = context["marketerId"]
+        index = self.campaign_index
+        refreshed = self.get_index_refreshed(marketer_id)
+
+        # campaigns are only served from the index when they are synced to provide
+        # context for child streams
+        from_index = not self.selected and refreshed is not None
+
+        if from_index and index.is_fresh(refreshed, self.campaign_index_ttl):
+            self.logger.info("Using campaigns from index: %s", index.path)
+            yield from index.get_campaigns(marketer_id)
+            return
+
+        if refreshed is None:
+            index.clear_campaigns(marketer_id)
+
+        # index is only complete if no changes were missed since the last refresh,
+        # or since the start date if there was none
+        since = self._get_last_modified_since(context)
+        complete = since is None or since <= (
+            refreshed or self._parse_datetime(self.config["start_date"])
+        )
+
+        listed = datetime.now(tz=timezone.utc)
+
+        for record in super().get_records(context):
+            index.update_campaign(marketer_id, record)
+
+            if not from_index:
+                yield record
+
+        if complete:
+            index.mark_campaigns_refreshed(
+                marketer_id,
+                listed,
+                include_archived=self.include_archived,
+                since=since,
+            )
+
+        index.save()
+
+        if from_index:
+            yield from index.get_campaigns(marketer_id)
+
     @override
     def post_process(self, row, context=None):
         row = super().post_process(row, context)
@@ -254,6 +328,60 @@ class CampaignStream(OutbrainStream):
     def get_child_context(self, record, context):
         return context | {"campaignId": record["id"]}
 
+    @override
+    def generate_child_contexts(self, record, context):
+        if not self.stream_maps[0].get_filter_result(record):
+            return ()
+
+        child_context = self.get_child_context(record, context)
+        live_status = record.get("liveStatus") or {}
+        live = live_status.get("campaignOnAir", record.get("enabled", False))
+
+        for child_stream in self.child_streams:
+            if child_stream.selected or child_stream.has_selected_descendents:
+                self.scheduler.schedule(child_stream, child_context, live=bool(live))
+
+        # child streams are synced by the scheduler in priority order
+        return ()
+
+    def get_index_refreshed(self, marketer_id: str):
+        """Get when the indexed campaigns of a marketer were last refreshed.
+
+        Args:
+            marketer_id: Marketer ID.
+
+        Returns:
+            When the campaigns were last refreshed, or `None` if they have not been
+            indexed compatibly with the current configuration.
+        """
+        return self.campaign_index.get_campaigns_refreshed(
+            marketer_id,
+            include_archived=self.include_archived,
+            start_date=self._parse_datetime(self.config["start_date"]),
+            max_age=self.campaign_index_max_age,
+        )
+
+    @cached_property
+    def campaign_index_max_age(self):
+        """Maximum age of indexed campaigns before all campaigns are listed again."""
+        return timedelta(minutes=self.config["campaign_index_max_age"])
+
+    def _get_last_modified_since(self, context):
+        if not self.selected:
+            # no bookmark, as unselected parent streams are synced in full
+            return self.get_index_refreshed(context["marketerId"])
+
+        if starting_timestamp := self.get_starting_timestamp(context):
+            return starting_timestamp
+
+        # partition not syncing, e.g. when planning, so fall back to its bookmark
+        start_date = self._parse_datetime(self.config["start_date"])
+        bookmark = self.get_context_state(context).get("replication_key_value")
+
+        return (
+            max(self._parse_datetime(bookmark), start_date) if bookmark else start_date
+        )
+
 
 class PromotedLinkStream(OutbrainStream):
     """Define promoted links stream."""
@@ -356,7 +484,7 @@ class PromotedLinkStream(OutbrainStream):
         return context | {"promotedLinkId": record["id"]}
 
 
-class PromotedLinkDailyPerformanceStream(OutbrainStream):
+class PromotedLinkDailyPerformanceStream(OutbrainReportStream):
     """Define promoted link daily performance stream."""
 
     _page_size = 7  # up to a week
@@ -430,7 +558,7 @@ class PromotedLinkDailyPerformanceStream(OutbrainStream):
     def get_url_params(self, context, next_page_token):
         params = super().get_url_params(context, next_page_token)
         params["breakdown"] = "daily"
-        params["from"] = self.get_starting_timestamp(context).date()
+        params["from"] = self.get_report_start_date(context)
         params["to"] = datetime.now(tz=timezone.utc).date()
         params["includeArchivedCampaigns"] = self.include_archived
         params["includeConversionDetails"] = True
@@ -452,10 +580,13 @@ class PromotedLinkDailyPerformanceStream(OutbrainStream):
         row["date"] = row.pop("metadata")["id"]
         row.update(row.pop("metrics"))
 
+        # number of results of the requested date range, rather than of the row
+        del row["totalResults"]
+
         return row
 
 
-class SectionDailyPerformanceStream(OutbrainStream):
+class SectionDailyPerformanceStream(OutbrainReportStream):
     """Define section daily performance stream."""
 
     _page_size = 500
@@ -534,7 +665,7 @@ class SectionDailyPerformanceStream(OutbrainStream):
     def get_url_params(self, context, next_page_token):
         params = super().get_url_params(context, next_page_token)
         params["campaignId"] = context["campaignId"]
-        params["from"] = self.get_starting_timestamp(context).date()
+        params["from"] = self.get_report_start_date(context)
         params["to"] = datetime.now(tz=timezone.utc).date()
         params["includeArchivedCampaigns"] = self.include_archived
         params["includeConversionDetails"] = True
@@ -585,4 +716,5 @@ class BudgetStream(OutbrainStream):
         th.Property("type", th.StringType),
         th.Property("pacing", th.StringType),
         th.Property("dailyTarget", th.NumberType),
+        th.Property("_sdc_deleted_at", th.DateTimeType),
     ).to_dict()
@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from pathlib import Path
 
+import click
+import platformdirs
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk.plugin_base import _ConfigInput
 from typing_extensions import override
 
 from tap_outbrain import streams
+from tap_outbrain.health import CircuitBreaker, RetryBudget
+from tap_outbrain.index import CampaignIndex
+from tap_outbrain.planner import RequestPlanner
+from tap_outbrain.profiling import StreamProfiler
+from tap_outbrain.scheduler import PriorityScheduler
+from tap_outbrain.state import CoalescingStateWriter
 
 STREAM_TYPES = [
     streams.MarketerStream,
@@ -24,6 +38,7 @@ class TapOutbrain(Tap):
     """Outbrain tap class."""
 
     _start_date = datetime.now(tz=timezone.utc) - timedelta(days=365)
+    _state_write_interval = 10  # seconds
 
     name = "tap-outbrain"
 
@@ -57,12 +72,278 @@ class TapOutbrain(Tap):
             description="Whether or not to extract archived data per stream",
             default=[],
         ),
+        th.Property(
+            "changed_only",
+            th.ArrayType(th.StringType),
+            title="Changed only",
+            description=(
+                "Streams to only extract new or changed records for, compared to the "
+                "previous run as of the incoming state (`marketers` and/or `budgets`)"
+            ),
+            default=[],
+        ),
+        th.Property(
+            "deduplicate",
+            th.ArrayType(th.StringType),
+            title="Deduplicate",
+            description=(
+                "Streams to suppress exact duplicate records for within a run (e.g. "
+                "`section_daily_performance` and/or `promoted_link_daily_performance`)"
+            ),
+            default=[],
+        ),
+        th.Property(
+            "deduplicate_capacity",
+            th.IntegerType(minimum=1),
+            title="Deduplicate capacity",
+            description=(
+                "Number of records per stream to remember for deduplication, after "
+                "which earlier records are forgotten (memory used is approximately 5.4 "
+                "bytes per record)"
+            ),
+            default=5_000_000,
+        ),
+        th.Property(
+            "emit_tombstones",
+            th.BooleanType,
+            title="Emit tombstones",
+            description=(
+                "Whether or not to extract records that have disappeared since the "
+                "previous run with only primary keys and `_sdc_deleted_at`, for "
+                "`changed_only` streams"
+            ),
+            default=False,
+        ),
+        th.Property(
+            "attribution_lookback_days",
+            th.IntegerType,
+            title="Attribution lookback days",
+            description=(
+                "Number of days before the bookmark to re-extract report data for on "
+                "each run, to pick up late-arriving conversion metrics (rows before "
+                "the bookmark are only extracted for dates with changed metrics)"
+            ),
+            default=0,
+        ),
+        th.Property(
+            "campaign_index_ttl",
+            th.IntegerType,
+            title="Campaign index TTL",
+            description=(
+                "Maximum age in minutes of the local marketer/campaign index before "
+                "it is refreshed, when the marketers or campaigns streams are only "
+                "synced to provide context for child streams (0 to always refresh "
+                "incrementally)"
+            ),
+            default=0,
+        ),
+        th.Property(
+            "campaign_index_max_age",
+            th.IntegerType(minimum=0),
+            title="Campaign index max age",
+            description=(
+                "Maximum age in minutes of the listing the local campaign index was "
+                "built from, after which all campaigns are listed again so that "
+                "campaigns archived or deleted since are dropped (0 to always list "
+                "all campaigns)"
+            ),
+            default=1440,
+        ),
+        th.Property(
+            "stream_priorities",
+            th.ObjectType(additional_properties=th.NumberType),
+            title="Stream priorities",
+            description=(
+                "Relative priority weight per campaign child stream (default 1), used "
+                "to order stream partitions after live and fresh ones"
+            ),
+            default={},
+        ),
+        th.Property(
+            "fetch_queue_pages",
+            th.IntegerType(minimum=0),
+            title="Fetch queue pages",
+            description=(
+                "Maximum number of pages to fetch ahead of records being emitted, "
+                "fetching pages in the background while records are emitted (`0` to "
+                "fetch and emit sequentially)"
+            ),
+            default=0,
+        ),
+        th.Property(
+            "fetch_queue_bytes",
+            th.IntegerType(minimum=1),
+            title="Fetch queue bytes",
+            description=(
+                "Maximum total size in bytes of pages to fetch ahead of records being "
+                "emitted"
+            ),
+            default=50_000_000,
+        ),
+        th.Property(
+            "circuit_breaker_threshold",
+            th.NumberType,
+            title="Circuit breaker threshold",
+            description=(
+                "Failure rate of recent requests to an endpoint at which it is "
+                "considered unhealthy, deferring partitions that request it"
+            ),
+            default=0.5,
+        ),
+        th.Property(
+            "circuit_breaker_cooldown",
+            th.IntegerType,
+            title="Circuit breaker cooldown",
+            description="Seconds to wait before retrying an unhealthy endpoint",
+            default=300,
+        ),
+        th.Property(
+            "max_retries",
+            th.IntegerType,
+            title="Max retries",
+            description=(
+                "Maximum number of failed requests to retry per run, excluding rate "
+                "limited requests"
+            ),
+            default=250,
+        ),
+        th.Property(
+            "requests_per_minute",
+            th.IntegerType(minimum=1),
+            title="Requests per minute",
+            description=(
+                "Number of requests per minute the account is rate limited to, to "
+                "estimate the duration of a sync with `--plan` (otherwise estimated "
+                "from the time per request alone)"
+            ),
+        ),
+        th.Property(
+            "profile",
+            th.BooleanType,
+            title="Profile",
+            description=(
+                "Whether or not to profile the sync, writing a cProfile dump per "
+                "stream to the `profiles` directory of the tap cache directory (also "
+                "enabled by setting the `TAP_OUTBRAIN_PROFILE` environment variable to "
+                "`true`)"
+            ),
+            default=False,
+        ),
     ).to_dict()
 
+    @override
+    @classmethod
+    def invoke(cls, *, plan: bool = False, **kwargs) -> None:
+        """Invoke the tap's command line interface.
+
+        Args:
+            plan: Whether or not to plan a sync instead of syncing.
+            kwargs: Keyword arguments of `Tap.invoke`.
+        """
+        if not plan:
+            super().invoke(**kwargs)
+            return
+
+        config: _ConfigInput = kwargs.get("config") or _ConfigInput()
+        state, catalog = kwargs.get("state"), kwargs.get("catalog")
+
+        tap = cls(
+            config=config.config,
+            state=None if state is None else json.loads(state.read()),
+            catalog=None if catalog is None else json.loads(catalog.read()),
+            parse_env_config=config.parse_env,
+            validate_config=True,
+        )
+        tap.write_plan()
+
+    @override
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        command = super().get_singer_command()
+        command.params.append(
+            click.Option(
+                ["--plan"],
+                is_flag=True,
+                help=(
+                    "Estimate the partitions, pages, requests and duration of a sync "
+                    "without syncing."
+                ),
+            )
+        )
+
+        return command
+
+    def write_plan(self) -> None:
+        """Write a plan of the requests and duration of a sync to stdout."""
+        plan = RequestPlanner(self).plan()
+        print(json.dumps(plan, indent=2))  # noqa: T201
+
     @override
     def discover_streams(self):
         return [stream_cls(tap=self) for stream_cls in STREAM_TYPES]
 
+    @override
+    @cached_property
+    def state_writer(self):
+        return CoalescingStateWriter(super().state_writer, self._state_write_interval)
+
+    @cached_property
+    def campaign_index(self):
+        """Local marketer/campaign index."""
+        return CampaignIndex(self.cache_dir / "campaign_index.json")
+
+    @cached_property
+    def scheduler(self):
+        """Priority scheduler for campaign child stream partitions."""
+        return PriorityScheduler(
+            self.config["stream_priorities"],
+            self.cache_dir / "deferred_partitions.json",
+            self.state_writer,
+            self.logger,
+        )
+
+    @cached_property
+    def circuit_breaker(self):
+        """Per-endpoint circuit breaker."""
+        return CircuitBreaker(
+            threshold=self.config["circuit_breaker_threshold"],
+            cooldown=timedelta(seconds=self.config["circuit_breaker_cooldown"]),
+        )
+
+    @cached_property
+    def retry_budget(self):
+        """Retry budget for the run."""
+        return RetryBudget(self.config["max_retries"])
+
+    @cached_property
+    def profiler(self):
+        """Per-stream sync profiler, if profiling is enabled."""
+        if not (
+            self.config["profile"]
+            or os.getenv("TAP_OUTBRAIN_PROFILE", "").lower() in {"1", "true"}
+        ):
+            return None
+
+        started = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = self.cache_dir / "profiles" / started
+        self.logger.info("Profiling sync, writing profiles to: %s", path)
+
+        return StreamProfiler(path)
+
+    @cached_property
+    def cache_dir(self):
+        """Local cache directory of the configured account."""
+        # not shared between accounts, or the index/report of one is used for another
+        account = hashlib.blake2b(
+            self.config["username"].encode(),
+            digest_size=8,
+        ).hexdigest()
+
+        path = Path(platformdirs.user_cache_dir(self.name)) / "accounts" / account
+        path.mkdir(parents=True, exist_ok=True)
+
+        return path
+
 
 if __name__ == "__main__":
     TapOutbrain.cli()
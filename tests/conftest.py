@@ -0,0 +1,149 @@
+"""Test fixtures for tap-outbrain."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import typing as t
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from tap_outbrain.planner import RequestPlanner
+from tap_outbrain.tap import TapOutbrain
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+CONFIG = {"username": "username", "password": "password", "start_date": "2026-01-01"}
+
+
+class FakeAPI(BaseAdapter):
+    """Fake Outbrain API, serving responses by request path."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes: dict[str, Callable[[dict], dict]] = {}
+        self.requests: list[tuple[str, dict]] = []
+        self.tap: TapOutbrain | None = None
+        self.messages: list[dict] = []
+
+    def route(self, path: str, body: dict | Callable[[dict], dict]) -> None:
+        """Serve a response body for a path, or a function of the query to one."""
+        self.routes[path] = body if callable(body) else lambda _: body
+
+    def get_queries(self, path: str) -> list[dict]:
+        """Get the query parameters of each request made to a path."""
+        return [query for p, query in self.requests if p == path]
+
+    def send(self, request, **kwargs):  # noqa: ARG002, D102
+        url = urlparse(request.url)
+        path = url.path.removeprefix("/amplify/v0.1")
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if path == "/login":
+            body = {"OB-TOKEN-V1": "token"}
+        else:
+            self.requests.append((path, query))
+            body = self.routes.get(path, lambda _: {})(query)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = json.dumps(body).encode()
+        return response
+
+    def close(self) -> None:  # noqa: D102
+        pass
+
+    def sync(
+        self,
+        selected: Iterable[str],
+        config: dict | None = None,
+        state: dict | None = None,
+    ) -> tuple[TapOutbrain, list[dict]]:
+        """Sync selected streams, returning the tap and the messages written."""
+        tap = self.tap = self._get_tap(selected, config, state)
+        output = io.StringIO()
+
+        try:
+            with contextlib.redirect_stdout(output):
+                tap.sync_all()
+        finally:
+            # kept for syncs that fail
+            self.messages = [
+                json.loads(line) for line in output.getvalue().splitlines()
+            ]
+
+        return tap, self.messages
+
+    def plan(
+        self,
+        selected: Iterable[str],
+        config: dict | None = None,
+        state: dict | None = None,
+    ) -> dict:
+        """Plan a sync of selected streams."""
+        return RequestPlanner(self._get_tap(selected, config, state)).plan()
+
+    def _get_tap(
+        self,
+        selected: Iterable[str],
+        config: dict | None,
+        state: dict | None,
+    ):
+        tap = TapOutbrain(
+            config=CONFIG | (config or {}),
+            state=state,
+            setup_mapper=False,
+        )
+
+        for stream_name, stream in tap.streams.items():
+            stream.selected = stream_name in selected
+
+        tap.setup_mapper()
+        self.requests.clear()
+
+        return tap
+
+    @staticmethod
+    def get_records(messages: list[dict], stream_name: str) -> list[dict]:
+        """Get the records of a stream from messages."""
+        return [
+            m["record"]
+            for m in messages
+            if m["type"] == "RECORD" and m["stream"] == stream_name
+        ]
+
+    @staticmethod
+    def get_state(messages: list[dict]) -> dict:
+        """Get the last state from messages."""
+        return [m for m in messages if m["type"] == "STATE"][-1]["value"]
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    """Fake Outbrain API for all requests, with the cache in a temporary directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    fake_api = FakeAPI()
+    fake_api.route("/marketers", {"marketers": [{"id": "m1", "name": "Marketer"}]})
+
+    session_init = requests.Session.__init__
+
+    def _session_init(self, *args, **kwargs):
+        session_init(self, *args, **kwargs)
+        self.mount("https://", fake_api)
+
+    monkeypatch.setattr(requests.Session, "__init__", _session_init)
+    monkeypatch.setattr(
+        requests,
+        "get",
+        lambda url, **kwargs: requests.Session().get(url, **kwargs),
+    )
+
+    return fake_api
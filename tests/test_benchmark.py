@@ -0,0 +1,238 @@
+"""Benchmarks syncing accounts with many campaigns.
+
+Skipped by default, as they take minutes on the SDK defaults this tap replaces. Run
+with e.g. `TAP_OUTBRAIN_BENCHMARK=300 pytest tests/test_benchmark.py -s` to sync a
+fake account with 300 campaigns.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import io
+import json
+import os
+import time
+import tracemalloc
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from singer_sdk.streams._state import StreamStateManager
+
+from tap_outbrain.state import PartitionStateManager
+from tap_outbrain.tap import TapOutbrain
+
+CAMPAIGNS = int(os.getenv("TAP_OUTBRAIN_BENCHMARK", "0"))
+REPORT_STREAMS = ("promoted_link_daily_performance", "section_daily_performance")
+ROWS_PER_DAY = 10
+LOOKBACK_DAYS = 7
+
+pytestmark = pytest.mark.skipif(
+    not CAMPAIGNS,
+    reason="set TAP_OUTBRAIN_BENCHMARK to a number of campaigns to benchmark",
+)
+
+
+class _FakeOutbrainAdapter(BaseAdapter):
+    """Serves a single marketer with a number of campaigns, each with report rows."""
+
+    def send(self, request, **kwargs):  # noqa: ARG002
+        url = urlparse(request.url)
+        query = parse_qs(url.query)
+        path = url.path.removeprefix("/amplify/v0.1")
+
+        if path == "/login":
+            body: dict = {"OB-TOKEN-V1": "token"}
+        elif path == "/marketers":
+            body = {"marketers": [{"id": "m1", "name": "Marketer"}]}
+        elif path.endswith("/campaigns"):
+            offset, limit = int(query["offset"][0]), int(query["limit"][0])
+            campaigns = [
+                {
+                    "id": f"c{i}",
+                    "marketerId": "m1",
+                    "lastModified": "2026-01-01 00:00:00",
+                    "enabled": True,
+                    "liveStatus": {"campaignOnAir": True},
+                }
+                for i in range(CAMPAIGNS)
+            ]
+            body = {
+                "campaigns": campaigns[offset : offset + limit],
+                "totalCount": len(campaigns),
+            }
+        elif path.endswith("/periodicContent"):
+            dates, total = _get_dates(query)
+            body = {
+                "promotedLinkResults": [
+                    {
+                        "promotedLinkId": f"{path.split('/')[-2]}-pl{i}",
+                        "results": [
+                            {"metadata": {"id": date}, "metrics": {"clicks": 1}}
+                            for date in dates
+                        ],
+                        "totalResults": total,
+                    }
+                    for i in range(ROWS_PER_DAY)
+                ]
+            }
+        elif path.endswith("/sections/date"):
+            dates, total = _get_dates(query)
+            body = {
+                "results": [
+                    {
+                        "metadata": {"date": date},
+                        "metrics": {"clicks": 1},
+                        "totalResults": total,
+                        "sections": [
+                            {"id": f"s{i}", "name": "Section"}
+                            for i in range(ROWS_PER_DAY)
+                        ],
+                    }
+                    for date in dates
+                ]
+            }
+        else:
+            body = {}
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = json.dumps(body).encode()
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _get_dates(query: dict[str, list[str]]):
+    # page of dates of the report range, and the number of dates in the range
+    start = datetime.date.fromisoformat(query["from"][0])
+    end = datetime.date.fromisoformat(query["to"][0])
+    dates = [
+        str(start + datetime.timedelta(days=i)) for i in range((end - start).days + 1)
+    ]
+    offset, limit = int(query["offset"][0]), int(query["limit"][0])
+
+    return dates[offset : offset + limit], len(dates)
+
+
+@pytest.fixture
+def fake_api(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    session_init = requests.Session.__init__
+
+    def _session_init(self, *args, **kwargs):
+        session_init(self, *args, **kwargs)
+        self.mount("https://", _FakeOutbrainAdapter())
+
+    monkeypatch.setattr(requests.Session, "__init__", _session_init)
+    monkeypatch.setattr(
+        requests,
+        "get",
+        lambda url, **kwargs: requests.Session().get(url, **kwargs),
+    )
+
+
+def _sync(state: dict):
+    tap = TapOutbrain(
+        config={
+            "username": "username",
+            "password": "password",
+            "attribution_lookback_days": LOOKBACK_DAYS,
+        },
+        state=state,
+        setup_mapper=False,
+    )
+
+    for stream_name, stream in tap.streams.items():
+        stream.selected = stream_name in REPORT_STREAMS
+
+    tap.setup_mapper()
+
+    output = io.StringIO()
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    with contextlib.redirect_stdout(output):
+        tap.sync_all()
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    messages = [json.loads(line) for line in output.getvalue().splitlines()]
+    records = sum(m["type"] == "RECORD" for m in messages)
+    states = [m["value"] for m in messages if m["type"] == "STATE"]
+    state_size = len(json.dumps(states[-1]))
+
+    print(  # noqa: T201
+        f"\n{CAMPAIGNS} campaigns: {elapsed:.1f}s, peak {peak / 1e6:.0f}MB, "
+        f"{records} records, {len(states)} state messages, "
+        f"state {state_size / 1e6:.1f}MB"
+    )
+
+    return records, states[-1]
+
+
+def test_sync(fake_api):
+    yesterday = datetime.datetime.now(
+        datetime.timezone.utc
+    ).date() - datetime.timedelta(days=1)
+    state = {
+        "bookmarks": {
+            stream_name: {
+                "partitions": [
+                    {
+                        "context": {"marketerId": "m1", "campaignId": f"c{i}"},
+                        "replication_key": "date",
+                        "replication_key_value": str(yesterday),
+                    }
+                    for i in range(CAMPAIGNS)
+                ]
+            }
+            for stream_name in REPORT_STREAMS
+        }
+    }
+
+    # all rows of the lookback, as none were extracted before
+    records, state = _sync(state)
+    days = LOOKBACK_DAYS + 2
+    assert records == CAMPAIGNS * len(REPORT_STREAMS) * ROWS_PER_DAY * days
+
+    # unchanged rows of the lookback are not extracted again
+    records, state = _sync(state)
+    assert records == CAMPAIGNS * len(REPORT_STREAMS) * ROWS_PER_DAY
+
+
+@pytest.mark.parametrize(
+    "state_manager_class", [StreamStateManager, PartitionStateManager]
+)
+def test_partition_state_lookup(state_manager_class):
+    contexts = [{"marketerId": "m1", "campaignId": f"c{i}"} for i in range(CAMPAIGNS)]
+    tap_state = {
+        "bookmarks": {
+            "stream": {
+                "partitions": [
+                    {"context": dict(c), "replication_key_value": "2026-01-01"}
+                    for c in contexts
+                ]
+            }
+        }
+    }
+
+    state_manager = state_manager_class(stream_name="stream", tap_state=tap_state)
+    started = time.perf_counter()
+
+    for context in contexts:
+        for _ in range(5):
+            state_manager.get_context_state(context)
+
+    print(  # noqa: T201
+        f"\n{state_manager_class.__name__}: {time.perf_counter() - started:.2f}s for "
+        f"{len(contexts) * 5} lookups over {len(contexts)} partitions"
+    )
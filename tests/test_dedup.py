@@ -0,0 +1,53 @@
+"""Tests in-run record deduplication."""
+
+from __future__ import annotations
+
+import pytest
+
+from tap_outbrain.dedup import BloomFilter
+
+
+def test_detects_duplicates():
+    bloom_filter = BloomFilter(10)
+
+    assert not bloom_filter.add(b"a")
+    assert not bloom_filter.add(b"b")
+    assert bloom_filter.add(b"a")
+    assert bloom_filter.add(b"b")
+
+    # duplicates are not counted towards capacity
+    assert bloom_filter.count == 2
+
+
+def test_no_false_positives_for_distinct_items():
+    bloom_filter = BloomFilter(10_000)
+
+    assert not any(bloom_filter.add(f"record-{i}".encode()) for i in range(10_000))
+
+
+def test_clears_at_capacity():
+    bloom_filter = BloomFilter(3)
+
+    for item in (b"a", b"b", b"c"):
+        bloom_filter.add(item)
+
+    # cleared to make room, so earlier items are forgotten
+    assert not bloom_filter.add(b"d")
+    assert bloom_filter.count == 1
+    assert not bloom_filter.add(b"a")
+    assert bloom_filter.add(b"d")
+
+
+def test_clear():
+    bloom_filter = BloomFilter(10)
+    bloom_filter.add(b"a")
+    bloom_filter.clear()
+
+    assert bloom_filter.count == 0
+    assert not bloom_filter.add(b"a")
+
+
+@pytest.mark.parametrize("capacity", [0, -1])
+def test_invalid_capacity(capacity):
+    with pytest.raises(ValueError, match="Capacity must be at least 1"):
+        BloomFilter(capacity)
@@ -0,0 +1,353 @@
+"""Tests extracting changed records only."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from tap_outbrain.fingerprints import STATE_KEY, DateFingerprints, RecordFingerprints
+from tap_outbrain.streams import BudgetStream
+
+
+def test_fingerprints():
+    state: dict = {}
+    fingerprints = RecordFingerprints(state, ["id"])
+
+    assert fingerprints.update({"id": "1", "name": "a"})
+    assert fingerprints.update({"id": "2", "name": "b"})
+
+    # not committed yet
+    assert state == {}
+
+    fingerprints.commit()
+    fingerprints = RecordFingerprints(state, ["id"])
+
+    assert not fingerprints.update({"id": "1", "name": "a"})
+    assert fingerprints.update({"id": "2", "name": "c"})
+    assert fingerprints.update({"id": "3", "name": "d"})
+    assert fingerprints.get_missing() == []
+
+
+def test_fingerprints_missing():
+    state: dict = {}
+    fingerprints = RecordFingerprints(state, ["id", "date"])
+    fingerprints.update({"id": "1", "date": "2026-01-01"})
+    fingerprints.update({"id": "1", "date": "2026-01-02"})
+    fingerprints.commit()
+
+    fingerprints = RecordFingerprints(state, ["id", "date"])
+    fingerprints.update({"id": "1", "date": "2026-01-01"})
+
+    assert fingerprints.get_missing() == [{"id": "1", "date": "2026-01-02"}]
+
+
+def _route_marketers(api, *marketers: dict):
+    api.route("/marketers", {"marketers": list(marketers)})
+
+
+def _sync_marketers(api, state=None, **config):
+    return api.sync(
+        {"marketers"},
+        {"changed_only": ["marketers"], **config},
+        state=state,
+    )
+
+
+def test_changed_only(api):
+    _route_marketers(
+        api,
+        {"id": "m1", "name": "Unchanged"},
+        {"id": "m2", "name": "Changed"},
+        {"id": "m3", "name": "Deleted"},
+    )
+    _, messages = _sync_marketers(api)
+
+    assert [r["id"] for r in api.get_records(messages, "marketers")] == [
+        "m1",
+        "m2",
+        "m3",
+    ]
+
+    _route_marketers(
+        api,
+        {"id": "m1", "name": "Unchanged"},
+        {"id": "m2", "name": "Changed again"},
+        {"id": "m4", "name": "New"},
+    )
+    _, messages = _sync_marketers(api, api.get_state(messages))
+
+    # without tombstones, deleted records are not extracted
+    assert api.get_records(messages, "marketers") == [
+        {"id": "m2", "name": "Changed again"},
+        {"id": "m4", "name": "New"},
+    ]
+
+    fingerprints = api.get_state(messages)["bookmarks"]["marketers"][STATE_KEY]
+    assert sorted(fingerprints) == ['["m1"]', '["m2"]', '["m4"]']
+
+
+def test_changed_only_tombstones(api):
+    _route_marketers(api, {"id": "m1"}, {"id": "m2"})
+    _, messages = _sync_marketers(api, emit_tombstones=True)
+
+    _route_marketers(api, {"id": "m1"})
+    _, messages = _sync_marketers(api, api.get_state(messages), emit_tombstones=True)
+    records = api.get_records(messages, "marketers")
+
+    assert len(records) == 1
+    assert records[0].keys() == {"id", "_sdc_deleted_at"}
+    assert records[0]["id"] == "m2"
+
+    # tombstones are extracted once only
+    _, messages = _sync_marketers(api, api.get_state(messages), emit_tombstones=True)
+    assert api.get_records(messages, "marketers") == []
+
+
+def test_changed_only_fingerprints_committed_after_records(api):
+    _route_marketers(api, {"id": "m1"}, {"id": "m2"})
+    _, messages = _sync_marketers(api, emit_tombstones=True)
+
+    _route_marketers(api, {"id": "m1", "name": "Changed"})
+    _, messages = _sync_marketers(api, api.get_state(messages), emit_tombstones=True)
+    fingerprints = [
+        sorted(m["value"]["bookmarks"]["marketers"][STATE_KEY])
+        for m in messages
+        if m["type"] == "STATE"
+    ]
+
+    # written with the first state following the changed records and tombstones
+    assert [m["type"] for m in messages] == [
+        "STATE",
+        "SCHEMA",
+        "RECORD",
+        "RECORD",
+        "STATE",
+    ]
+    assert fingerprints == [['["m1"]', '["m2"]'], ['["m1"]']]
+
+
+def test_changed_only_fingerprints_not_committed_on_failure(api, monkeypatch):
+    post_process = BudgetStream.post_process
+    api.route("/marketers/m1/budgets", {"budgets": [{"id": "b1"}, {"id": "b2"}]})
+    _, messages = api.sync({"budgets"}, {"changed_only": ["budgets"]})
+    state = api.get_state(messages)
+
+    def _post_process(self, row, context=None):
+        if row["id"] == "b2":
+            msg = "failed"
+            raise ValueError(msg)
+
+        return row
+
+    monkeypatch.setattr(BudgetStream, "post_process", _post_process)
+    api.route(
+        "/marketers/m1/budgets",
+        {"budgets": [{"id": "b1", "name": "Changed"}, {"id": "b2"}]},
+    )
+
+    with pytest.raises(ValueError, match="failed"):
+        api.sync({"budgets"}, {"changed_only": ["budgets"]}, state=state)
+
+    assert api.tap is not None
+    partition_state = api.tap.streams["budgets"].get_context_state({"marketerId": "m1"})
+
+    assert api.get_records(api.messages, "budgets") == [{"id": "b1", "name": "Changed"}]
+    assert (
+        partition_state[STATE_KEY]
+        == state["bookmarks"]["budgets"]["partitions"][0][STATE_KEY]
+    )
+
+    # the changed record is extracted again by the next sync
+    monkeypatch.setattr(BudgetStream, "post_process", post_process)
+    _, messages = api.sync({"budgets"}, {"changed_only": ["budgets"]}, state=state)
+
+    assert api.get_records(messages, "budgets") == [{"id": "b1", "name": "Changed"}]
+
+
+@pytest.mark.parametrize(
+    ("changed_only", "activate_version"),
+    [
+        pytest.param([], True, id="all"),
+        pytest.param(["marketers"], False, id="changed-only"),
+    ],
+)
+def test_activate_version_messages(api, changed_only, activate_version):
+    _, messages = api.sync(
+        {"marketers"},
+        {"changed_only": changed_only, "emit_activate_version_messages": True},
+    )
+
+    # unchanged records are not extracted, so must not be deactivated
+    assert any(m["type"] == "ACTIVATE_VERSION" for m in messages) is activate_version
+
+
+def test_date_fingerprints():
+    state: dict = {}
+    fingerprints = DateFingerprints(state, "date", since="2026-01-03")
+
+    for d in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        assert fingerprints.update({"id": "1", "date": d}) is (d >= "2026-01-03")
+
+    # dates before the bookmark not seen before are changed
+    assert fingerprints.get_held_records() == [
+        {"id": "1", "date": "2026-01-01"},
+        {"id": "1", "date": "2026-01-02"},
+    ]
+
+    fingerprints.commit()
+    fingerprints = DateFingerprints(state, "date", since="2026-01-03")
+    fingerprints.update({"id": "2", "date": "2026-01-01"})
+    fingerprints.update({"id": "1", "date": "2026-01-01"})
+    fingerprints.update({"id": "1", "date": "2026-01-02", "clicks": 1})
+
+    # the records of a date are held back until all are seen, so its digest does not
+    # depend on their order
+    assert fingerprints.get_held_records() == [
+        {"id": "2", "date": "2026-01-01"},
+        {"id": "1", "date": "2026-01-01"},
+        {"id": "1", "date": "2026-01-02", "clicks": 1},
+    ]
+
+    fingerprints.commit()
+    fingerprints = DateFingerprints(state, "date", since="2026-01-03")
+    fingerprints.update({"id": "1", "date": "2026-01-01"})
+    fingerprints.update({"id": "2", "date": "2026-01-01"})
+    fingerprints.update({"id": "1", "date": "2026-01-02", "clicks": 1})
+
+    assert fingerprints.get_held_records() == []
+
+
+def test_date_fingerprints_state_per_date():
+    state: dict = {}
+    fingerprints = DateFingerprints(state, "date", since=None)
+
+    for i in range(100):
+        fingerprints.update({"id": str(i), "date": f"2026-01-0{i % 3 + 1}"})
+
+    fingerprints.commit()
+
+    assert sorted(state[STATE_KEY]) == ["2026-01-01", "2026-01-02", "2026-01-03"]
+
+
+TODAY = datetime.now(tz=timezone.utc).date()
+SECTIONS_PATH = "/reports/marketers/m1/sections/date"
+
+
+def _route_sections(api, clicks: dict[date, int] | None = None):
+    clicks = clicks or {}
+
+    def _sections(query: dict):
+        start = date.fromisoformat(query["from"])
+        dates = [start + timedelta(days=i) for i in range((TODAY - start).days + 1)]
+
+        return {
+            "results": [
+                {
+                    "metadata": {"date": str(d)},
+                    "metrics": {"clicks": clicks.get(d, 0)},
+                    "totalResults": len(dates),
+                    "sections": [{"id": "s1"}, {"id": "s2"}],
+                }
+                for d in dates
+            ]
+        }
+
+    api.route(
+        "/marketers/m1/campaigns",
+        {
+            "campaigns": [
+                {
+                    "id": "c1",
+                    "marketerId": "m1",
+                    "lastModified": datetime.now(tz=timezone.utc).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    ),
+                    "enabled": True,
+                    "liveStatus": {"campaignOnAir": True},
+                }
+            ],
+            "totalCount": 1,
+        },
+    )
+    api.route(SECTIONS_PATH, _sections)
+
+
+def _sections_state(bookmark: date, state: dict | None = None):
+    # the bookmark of a previous state, moved back
+    partition = {
+        "context": {"marketerId": "m1", "campaignId": "c1"},
+        "replication_key": "date",
+        "replication_key_value": str(bookmark),
+    }
+
+    if state:
+        partitions = state["bookmarks"]["section_daily_performance"]["partitions"]
+        partition[STATE_KEY] = partitions[0][STATE_KEY]
+
+    return {"bookmarks": {"section_daily_performance": {"partitions": [partition]}}}
+
+
+def _sync_sections(api, state, **config):
+    _, messages = api.sync(
+        {"section_daily_performance"},
+        {"attribution_lookback_days": 3, **config},
+        state=state,
+    )
+    records = api.get_records(messages, "section_daily_performance")
+
+    return sorted((r["date"], r["id"]) for r in records), api.get_state(messages)
+
+
+def _days_ago(days: int):
+    return TODAY - timedelta(days=days)
+
+
+def test_report_rows_before_bookmark_only_extracted_if_changed(api):
+    _route_sections(api)
+    records, state = _sync_sections(api, _sections_state(_days_ago(1)))
+
+    # dates of the lookback not seen before
+    assert records == [
+        (str(_days_ago(d)), s) for d in (4, 3, 2, 1, 0) for s in ("s1", "s2")
+    ]
+
+    # one digest per extracted date
+    partition_state = state["bookmarks"]["section_daily_performance"]["partitions"][0]
+    assert sorted(partition_state[STATE_KEY]) == [
+        str(_days_ago(d)) for d in (4, 3, 2, 1, 0)
+    ]
+
+    _route_sections(api, {_days_ago(2): 1})
+    records, state = _sync_sections(api, _sections_state(_days_ago(1), state))
+
+    # all rows of changed dates, and from the bookmark on
+    assert records == [(str(_days_ago(d)), s) for d in (2, 1, 0) for s in ("s1", "s2")]
+
+    records, _ = _sync_sections(api, state)
+
+    # bookmark moved on to today
+    assert records == [(str(TODAY), "s1"), (str(TODAY), "s2")]
+
+
+def test_report_rows_from_bookmark_always_extracted(api):
+    _route_sections(api)
+    _, state = _sync_sections(api, _sections_state(_days_ago(3)))
+    records, _ = _sync_sections(api, _sections_state(_days_ago(3), state))
+
+    # unchanged, but not re-extracted for the lookback
+    assert records == [
+        (str(_days_ago(d)), s) for d in (3, 2, 1, 0) for s in ("s1", "s2")
+    ]
+
+
+def test_report_lookback_clamped_to_start_date(api):
+    _route_sections(api)
+    records, _ = _sync_sections(
+        api,
+        _sections_state(_days_ago(1)),
+        start_date=str(_days_ago(2)),
+    )
+
+    assert api.get_queries(SECTIONS_PATH)[0]["from"] == str(_days_ago(2))
+    assert records == [(str(_days_ago(d)), s) for d in (2, 1, 0) for s in ("s1", "s2")]
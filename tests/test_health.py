@@ -0,0 +1,207 @@
+"""Tests endpoint health tracking."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+import requests
+from singer_sdk.exceptions import RetriableAPIError
+
+from tap_outbrain import health
+from tap_outbrain.health import (
+    CircuitBreaker,
+    EndpointUnavailableError,
+    RetryBudget,
+    RetryBudgetExhaustedError,
+)
+from tap_outbrain.tap import TapOutbrain
+
+ENDPOINT = "/endpoint"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch):
+    clock = _Clock()
+    monkeypatch.setattr(health.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def circuit_breaker(clock):
+    return CircuitBreaker(
+        threshold=0.5,
+        cooldown=datetime.timedelta(seconds=60),
+        window=4,
+        min_requests=4,
+    )
+
+
+def _open(circuit_breaker: CircuitBreaker):
+    for success in (True, True, False, False):
+        circuit_breaker.record(ENDPOINT, success=success)
+
+
+def test_closed_below_min_requests(circuit_breaker):
+    for _ in range(3):
+        circuit_breaker.record(ENDPOINT, success=False)
+
+    circuit_breaker.check(ENDPOINT)
+
+
+def test_closed_below_threshold(circuit_breaker):
+    for success in (True, True, True, False):
+        circuit_breaker.record(ENDPOINT, success=success)
+
+    circuit_breaker.check(ENDPOINT)
+    assert circuit_breaker.get_failure_rates() == {ENDPOINT: 0.25}
+
+
+def test_opens_at_threshold(circuit_breaker):
+    _open(circuit_breaker)
+
+    with pytest.raises(EndpointUnavailableError):
+        circuit_breaker.check(ENDPOINT)
+
+    # other endpoints are unaffected
+    circuit_breaker.check("/other")
+
+
+def test_window_discards_old_outcomes(circuit_breaker):
+    for success in (False, False, False, True, True, True):
+        circuit_breaker.record(ENDPOINT, success=success)
+
+    circuit_breaker.check(ENDPOINT)
+
+
+def test_open_until_cooldown(circuit_breaker, clock):
+    _open(circuit_breaker)
+    clock.now += 59
+
+    with pytest.raises(EndpointUnavailableError):
+        circuit_breaker.check(ENDPOINT)
+
+    clock.now += 1
+    circuit_breaker.check(ENDPOINT)
+
+
+def test_closes_on_successful_trial(circuit_breaker, clock):
+    _open(circuit_breaker)
+    clock.now += 60
+
+    circuit_breaker.check(ENDPOINT)
+    circuit_breaker.record(ENDPOINT, success=True)
+
+    circuit_breaker.check(ENDPOINT)
+
+    # failure rate is calculated afresh
+    circuit_breaker.record(ENDPOINT, success=False)
+    assert circuit_breaker.get_failure_rates() == {ENDPOINT: 1.0}
+    circuit_breaker.check(ENDPOINT)
+
+
+def test_reopens_on_failed_trial(circuit_breaker, clock):
+    _open(circuit_breaker)
+    clock.now += 60
+
+    circuit_breaker.check(ENDPOINT)
+    circuit_breaker.record(ENDPOINT, success=False)
+
+    with pytest.raises(EndpointUnavailableError):
+        circuit_breaker.check(ENDPOINT)
+
+    # cooldown restarts from the failed trial
+    clock.now += 59
+
+    with pytest.raises(EndpointUnavailableError):
+        circuit_breaker.check(ENDPOINT)
+
+
+def test_retry_budget():
+    retry_budget = RetryBudget(2)
+    retry_budget.consume()
+    retry_budget.consume()
+
+    with pytest.raises(RetryBudgetExhaustedError):
+        retry_budget.consume()
+
+
+def _response(status_code: int, headers: dict | None = None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def stream(monkeypatch: pytest.MonkeyPatch):
+    # retry without waiting
+    monkeypatch.setattr("backoff._sync.time.sleep", lambda _: None)
+
+    tap = TapOutbrain(
+        config={
+            "username": "username",
+            "password": "password",
+            "start_date": "2025-01-01",
+            "max_retries": 3,
+            "circuit_breaker_threshold": 0.5,
+        },
+        setup_mapper=False,
+    )
+
+    return tap.streams["marketers"]
+
+
+def test_rate_limited_requests_not_recorded(stream):
+    def _request(prepared_request, context):
+        response = _response(429, {"rate-limit-msec-left": "0"})
+        raise RetriableAPIError("Too many requests", response)
+
+    with pytest.raises(RetriableAPIError):
+        stream.request_decorator(_request)(None, None)
+
+    circuit_breaker = stream._tap.circuit_breaker
+    assert circuit_breaker.get_failure_rates() == {}
+    assert stream._tap.retry_budget.remaining == 3
+
+
+def test_failed_requests_recorded_and_retries_consumed(stream):
+    def _request(prepared_request, context):
+        raise RetriableAPIError("Server error", _response(500))
+
+    with pytest.raises(RetryBudgetExhaustedError):
+        stream.request_decorator(_request)(None, None)
+
+    circuit_breaker = stream._tap.circuit_breaker
+    assert circuit_breaker.get_failure_rates() == {stream.path: 1.0}
+    assert stream._tap.retry_budget.remaining == 0
+
+
+def test_one_outcome_recorded_per_request(stream):
+    stream._tap.retry_budget = RetryBudget(10)
+    attempts = 0
+
+    def _request(prepared_request, context):
+        nonlocal attempts
+        attempts += 1
+
+        if attempts < 6:
+            raise RetriableAPIError("Server error", _response(500))
+
+        return _response(200)
+
+    stream.request_decorator(_request)(None, None)
+
+    # retries of a single request do not open the circuit on their own
+    circuit_breaker = stream._tap.circuit_breaker
+    assert attempts == 6
+    assert circuit_breaker.get_failure_rates() == {stream.path: 0.0}
+    circuit_breaker.check(stream.path)
@@ -0,0 +1,246 @@
+"""Tests the local campaign index."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tap_outbrain.index import CampaignIndex
+
+NOW = datetime.now(tz=timezone.utc)
+START_DATE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+MAX_AGE = timedelta(days=1)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return CampaignIndex(tmp_path / "campaign_index.json")
+
+
+def _campaign(campaign_id: str, *, on_air: bool = True):
+    return {
+        "id": campaign_id,
+        "marketerId": "m1",
+        "lastModified": "2026-01-01 00:00:00",
+        "enabled": on_air,
+        "liveStatus": {"campaignOnAir": on_air},
+    }
+
+
+def _refreshed(
+    index: CampaignIndex,
+    *,
+    include_archived: bool = False,
+    start_date: datetime = START_DATE,
+    max_age: timedelta = MAX_AGE,
+):
+    return index.get_campaigns_refreshed(
+        "m1",
+        include_archived=include_archived,
+        start_date=start_date,
+        max_age=max_age,
+    )
+
+
+def _mark_refreshed(index: CampaignIndex, refreshed=NOW, since=None):
+    index.mark_campaigns_refreshed(
+        "m1",
+        refreshed,
+        include_archived=False,
+        since=since,
+    )
+
+
+def test_save_and_load(index):
+    index.update_marketers(["m1"], NOW)
+    index.update_campaign("m1", _campaign("c1"))
+    _mark_refreshed(index)
+    index.save()
+
+    loaded = CampaignIndex(index.path)
+
+    assert loaded.marketers_refreshed == NOW
+    assert loaded.marketer_ids == ["m1"]
+    assert list(loaded.get_campaigns("m1")) == [_campaign("c1")]
+    assert _refreshed(loaded) == NOW
+
+
+def test_update_marketers_keeps_campaigns_of_retained_marketers(index):
+    index.update_marketers(["m1", "m2"], NOW)
+    index.update_campaign("m1", _campaign("c1"))
+    index.update_campaign("m2", _campaign("c2"))
+    index.update_marketers(["m1"], NOW)
+
+    assert index.marketer_ids == ["m1"]
+    assert list(index.get_campaigns("m1")) == [_campaign("c1")]
+    assert list(index.get_campaigns("m2")) == []
+
+
+@pytest.mark.parametrize(
+    ("refreshed", "fresh"),
+    [
+        pytest.param(None, False, id="never"),
+        pytest.param(NOW - timedelta(minutes=59), True, id="within"),
+        pytest.param(NOW - timedelta(minutes=61), False, id="expired"),
+    ],
+)
+def test_is_fresh(refreshed, fresh):
+    assert CampaignIndex.is_fresh(refreshed, timedelta(hours=1)) is fresh
+
+
+def test_not_refreshed(index):
+    index.update_campaign("m1", _campaign("c1"))
+
+    assert _refreshed(index) is None
+
+
+def test_include_archived_mismatch(index):
+    _mark_refreshed(index)
+
+    assert _refreshed(index, include_archived=True) is None
+
+
+def test_legacy_entry(index):
+    _mark_refreshed(index)
+    marketer = index._data["marketers"]["m1"]
+    del marketer["since"]
+    del marketer["listed"]
+
+    assert _refreshed(index) is None
+
+
+def test_full_listing_covers_any_start_date(index):
+    _mark_refreshed(index, since=None)
+
+    assert _refreshed(index, start_date=START_DATE - timedelta(days=365)) == NOW
+
+
+def test_start_date_before_listing(index):
+    _mark_refreshed(index, since=START_DATE)
+
+    assert _refreshed(index) == NOW
+    assert _refreshed(index, start_date=START_DATE + timedelta(days=1)) == NOW
+    assert _refreshed(index, start_date=START_DATE - timedelta(days=1)) is None
+
+
+def test_since_and_listed_recorded_on_first_refresh_only(index):
+    listed = NOW - timedelta(hours=2)
+    _mark_refreshed(index, refreshed=listed, since=START_DATE)
+    _mark_refreshed(index, since=NOW - timedelta(hours=2))
+
+    # later refreshes extend the first listing, so do not move its lower bound
+    assert _refreshed(index) == NOW
+    assert index._data["marketers"]["m1"]["listed"] == listed.isoformat()
+
+    index.clear_campaigns("m1")
+    _mark_refreshed(index, since=START_DATE + timedelta(days=1))
+
+    assert _refreshed(index) is None
+
+
+def test_listing_max_age(index):
+    _mark_refreshed(index, refreshed=NOW - MAX_AGE)
+    _mark_refreshed(index)
+
+    # incremental refreshes do not drop archived or deleted campaigns, so they are
+    # listed in full again once the first listing is too old
+    assert _refreshed(index) is None
+    assert _refreshed(index, max_age=MAX_AGE * 2) == NOW
+
+
+def _route_campaigns(api, *campaign_ids: str):
+    api.route(
+        "/marketers/m1/campaigns",
+        {
+            "campaigns": [_campaign(c) for c in campaign_ids],
+            "totalCount": len(campaign_ids),
+        },
+    )
+
+    for campaign_id in ("c1", "c2", "c3"):
+        api.route(
+            f"/campaigns/{campaign_id}/promotedLinks",
+            {"promotedLinks": [], "totalCount": 0},
+        )
+
+
+def _synced_campaign_ids(api):
+    return sorted(
+        path.split("/")[2] for path, _ in api.requests if path.endswith("Links")
+    )
+
+
+def test_child_streams_driven_from_index(api):
+    _route_campaigns(api, "c1", "c2")
+    api.sync({"promoted_links"})
+
+    assert (
+        api.get_queries("/marketers/m1/campaigns")[0].get("daysToLookBackForChanges")
+        is None
+    )
+    assert _synced_campaign_ids(api) == ["c1", "c2"]
+
+    # only changed campaigns are listed, but all indexed campaigns are synced
+    _route_campaigns(api, "c3")
+    api.sync({"promoted_links"})
+
+    assert "daysToLookBackForChanges" in api.get_queries("/marketers/m1/campaigns")[0]
+    assert _synced_campaign_ids(api) == ["c1", "c2", "c3"]
+
+
+def test_fresh_index_not_refreshed(api):
+    _route_campaigns(api, "c1")
+    api.sync({"promoted_links"}, {"campaign_index_ttl": 60})
+    api.sync({"promoted_links"}, {"campaign_index_ttl": 60})
+
+    assert api.get_queries("/marketers") == []
+    assert api.get_queries("/marketers/m1/campaigns") == []
+    assert _synced_campaign_ids(api) == ["c1"]
+
+
+def test_index_listed_again_after_max_age(api):
+    _route_campaigns(api, "c1", "c2")
+    api.sync({"promoted_links"}, {"campaign_index_max_age": 0})
+
+    # c2 archived or deleted
+    _route_campaigns(api, "c1")
+    api.sync({"promoted_links"}, {"campaign_index_max_age": 0})
+
+    assert (
+        api.get_queries("/marketers/m1/campaigns")[0].get("daysToLookBackForChanges")
+        is None
+    )
+    assert _synced_campaign_ids(api) == ["c1"]
+
+
+def test_partial_listing_not_indexed_as_complete(api):
+    campaign = _campaign("c1") | {"lastModified": NOW.strftime("%Y-%m-%d %H:%M:%S")}
+    api.route("/marketers/m1/campaigns", {"campaigns": [campaign], "totalCount": 1})
+    bookmark = (NOW - timedelta(days=3)).isoformat()
+    state = {
+        "bookmarks": {
+            "campaigns": {
+                "partitions": [
+                    {
+                        "context": {"marketerId": "m1"},
+                        "replication_key": "lastModified",
+                        "replication_key_value": bookmark,
+                    }
+                ]
+            }
+        }
+    }
+
+    tap, _ = api.sync({"campaigns"}, state=state)
+
+    # campaigns were only listed from the bookmark, so may be missing from the index
+    assert tap.streams["campaigns"].get_index_refreshed("m1") is None
+
+
+def test_cache_dir_per_account(api):
+    tap, _ = api.sync(set())
+    other_tap, _ = api.sync(set(), {"username": "other"})
+
+    assert tap.cache_dir != other_tap.cache_dir
+    assert tap.campaign_index.path.parent == tap.cache_dir
@@ -0,0 +1,118 @@
+"""Tests the bounded fetch pipeline."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from tap_outbrain.pipeline import FetchPipeline
+
+
+class _Page:
+    def __init__(self, number: int, size: int = 100) -> None:
+        self.number = number
+        self.content = b"x" * size
+
+
+class _Pages:
+    """Fake page iterator, recording pages fetched and whether it was closed."""
+
+    def __init__(self, count: int, error: Exception | None = None) -> None:
+        self.fetched: list[int] = []
+        self.closed = False
+        self._pages = self._fetch(count, error)
+
+    def _fetch(self, count: int, error: Exception | None):
+        for number in range(count):
+            self.fetched.append(number)
+            yield _Page(number)
+
+        if error:
+            raise error
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._pages)
+
+    def close(self) -> None:
+        self.closed = True
+        self._pages.close()
+
+
+def _wait_for_producer(pipeline: FetchPipeline) -> None:
+    # until the producer is waiting on the consumer, or done
+    with pipeline._condition:
+        pipeline._condition.wait_for(
+            lambda: pipeline._done or pipeline._is_full(100),
+            timeout=5,
+        )
+
+
+def test_pages_in_order():
+    pages = _Pages(10)
+    pipeline = FetchPipeline(max_pages=3, max_bytes=1000)
+
+    assert [p.number for p in pipeline.iter_pages(pages)] == list(range(10))
+    assert pages.closed
+
+
+@pytest.mark.parametrize(
+    ("max_pages", "max_bytes", "expected_depth"),
+    [
+        pytest.param(3, 1000, 3, id="pages"),
+        pytest.param(10, 250, 2, id="bytes"),
+    ],
+)
+def test_backpressure(max_pages, max_bytes, expected_depth):
+    pages = _Pages(10)
+    pipeline = FetchPipeline(max_pages=max_pages, max_bytes=max_bytes)
+
+    for consumed, _ in enumerate(pipeline.iter_pages(pages), 1):
+        _wait_for_producer(pipeline)
+
+        # fetched no further ahead than the queue allows, plus a page waiting to be
+        # queued
+        assert len(pages.fetched) - consumed <= expected_depth + 1
+
+    assert pipeline.max_depth == expected_depth
+    assert pipeline.max_depth_bytes == expected_depth * 100
+    assert pipeline.stall_duration > 0
+
+
+def test_oversized_page_queued_alone():
+    pipeline = FetchPipeline(max_pages=3, max_bytes=10)
+
+    assert len(list(pipeline.iter_pages(_Pages(3)))) == 3
+    assert pipeline.max_depth == 1
+
+
+def test_error_after_fetched_pages():
+    pages = _Pages(3, ValueError("failed"))
+    pipeline = FetchPipeline(max_pages=2, max_bytes=1000)
+    yielded = []
+
+    with pytest.raises(ValueError, match="failed"):
+        for page in pipeline.iter_pages(pages):
+            yielded.append(page.number)  # noqa: PERF401
+
+    # pages fetched before the error are still yielded
+    assert yielded == [0, 1, 2]
+
+
+def test_close_early_joins_producer():
+    pages = _Pages(100)
+    pipeline = FetchPipeline(max_pages=2, max_bytes=1000)
+    iter_pages = pipeline.iter_pages(pages)
+
+    next(iter_pages)
+    _wait_for_producer(pipeline)
+    iter_pages.close()
+
+    assert not any(t.name == "fetch-pipeline" for t in threading.enumerate())
+    assert pages.closed
+
+    # no more pages fetched than could be queued, plus a page waiting to be queued
+    assert len(pages.fetched) <= 4
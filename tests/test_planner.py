@@ -0,0 +1,152 @@
+"""Tests the dry-run request planner."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+NOW = datetime.now(tz=timezone.utc)
+TODAY = NOW.date()
+START_DATE = str(TODAY - timedelta(days=20))
+
+
+@pytest.fixture
+def campaigns_api(api):
+    api.route(
+        "/marketers/m1/campaigns",
+        {
+            "campaigns": [
+                {
+                    "id": campaign_id,
+                    "marketerId": "m1",
+                    "lastModified": NOW.strftime("%Y-%m-%d %H:%M:%S"),
+                    "enabled": True,
+                    "liveStatus": {"campaignOnAir": True},
+                }
+                for campaign_id in ("c1", "c2")
+            ],
+            "totalCount": 2,
+        },
+    )
+
+    for campaign_id in ("c1", "c2"):
+        api.route(
+            f"/campaigns/{campaign_id}/promotedLinks",
+            {"promotedLinks": [], "totalCount": 150},
+        )
+
+    return api
+
+
+def _report_state(bookmarks: dict[str, int]):
+    return {
+        "bookmarks": {
+            "promoted_link_daily_performance": {
+                "partitions": [
+                    {
+                        "context": {"marketerId": "m1", "campaignId": campaign_id},
+                        "replication_key": "date",
+                        "replication_key_value": str(TODAY - timedelta(days=days)),
+                    }
+                    for campaign_id, days in bookmarks.items()
+                ]
+            }
+        }
+    }
+
+
+def test_plan(campaigns_api):
+    plan = campaigns_api.plan(
+        {"budgets", "promoted_links", "promoted_link_daily_performance"},
+        {"start_date": START_DATE},
+        _report_state({"c1": 1}),
+    )
+    streams = plan["streams"]
+
+    assert streams["budgets"] == {"selected": True, "partitions": 1, "pages": 1}
+
+    # sampled total count of 150 promoted links, at 100 per page
+    assert streams["promoted_links"] == {"selected": True, "partitions": 2, "pages": 4}
+
+    # from the bookmark of c1 and the start date of c2, at 7 days per page
+    assert streams["promoted_link_daily_performance"] == {
+        "selected": True,
+        "partitions": 2,
+        "pages": 1 + 3,
+        "days": 2 + 21,
+        "from": START_DATE,
+        "to": str(TODAY),
+    }
+
+    assert plan["requests"] == sum(s["pages"] for s in streams.values())
+    assert not any(path.startswith("/reports") for path, _ in campaigns_api.requests)
+
+
+def test_plan_report_lookback(campaigns_api):
+    plan = campaigns_api.plan(
+        {"promoted_link_daily_performance"},
+        {"start_date": START_DATE, "attribution_lookback_days": 7},
+        _report_state({"c1": 1, "c2": 1}),
+    )
+
+    assert plan["streams"]["promoted_link_daily_performance"]["days"] == 2 * 9
+
+
+@pytest.mark.parametrize(
+    ("bookmark", "days_to_look_back"),
+    [
+        pytest.param(NOW - timedelta(days=3, hours=1), "3", id="bookmark"),
+        pytest.param(None, "20", id="start-date"),
+    ],
+)
+def test_plan_campaigns_listed_from_bookmark(
+    campaigns_api,
+    bookmark,
+    days_to_look_back,
+):
+    state = None
+
+    if bookmark:
+        state = {
+            "bookmarks": {
+                "campaigns": {
+                    "partitions": [
+                        {
+                            "context": {"marketerId": "m1"},
+                            "replication_key": "lastModified",
+                            "replication_key_value": bookmark.isoformat(),
+                        }
+                    ]
+                }
+            }
+        }
+
+    campaigns_api.plan({"campaigns"}, {"start_date": START_DATE}, state)
+    query = campaigns_api.get_queries("/marketers/m1/campaigns")[0]
+
+    # as when syncing, rather than listing all campaigns
+    assert query["daysToLookBackForChanges"] == days_to_look_back
+
+
+@pytest.mark.parametrize(
+    ("requests_per_minute", "bound"),
+    [
+        pytest.param(None, "latency", id="unlimited"),
+        pytest.param(1_000_000_000, "latency", id="latency"),
+        pytest.param(1, "rate_limit", id="rate-limit"),
+    ],
+)
+def test_plan_estimated_duration(campaigns_api, requests_per_minute, bound):
+    config = {"start_date": START_DATE}
+
+    if requests_per_minute:
+        config["requests_per_minute"] = requests_per_minute
+
+    plan = campaigns_api.plan({"promoted_link_daily_performance"}, config)
+
+    assert plan["requests_per_minute"] == requests_per_minute
+    assert plan["estimated_duration_bound"] == bound
+
+    if bound == "rate_limit":
+        assert plan["estimated_duration"] == str(timedelta(minutes=plan["requests"]))
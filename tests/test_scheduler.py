@@ -0,0 +1,177 @@
+"""Tests child stream partition scheduling."""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+from singer_sdk.helpers._state import StateWriter
+
+from tap_outbrain.health import EndpointUnavailableError, RetryBudgetExhaustedError
+from tap_outbrain.scheduler import PriorityScheduler
+from tap_outbrain.state import CoalescingStateWriter
+
+LOGGER = logging.getLogger("test")
+
+
+class _StateWriter(StateWriter):
+    def __init__(self) -> None:
+        self.states: list[dict] = []
+
+    def write_state(self, state) -> None:
+        self.states.append(state)
+
+
+class _Stream:
+    replication_key = "date"
+    logger = LOGGER
+
+    def __init__(self, name: str, synced: list, errors: dict | None = None) -> None:
+        self.name = name
+        self.config = {"start_date": "2000-01-01"}
+        self.state: dict[tuple, dict] = {}
+        self.synced = synced
+        self.errors = errors or {}
+
+    def sync(self, context: dict) -> None:
+        self.synced.append((self.name, context["campaignId"]))
+
+        if error := self.errors.get(context["campaignId"]):
+            self.get_context_state(context)["progress_markers"] = {}
+            raise error
+
+    def get_context_state(self, context: dict) -> dict:
+        return self.state.setdefault(tuple(sorted(context.items())), {})
+
+    def set_bookmark(self, campaign_id: str, days_ago: int) -> None:
+        bookmark = datetime.now(tz=timezone.utc) - timedelta(days=days_ago)
+        context = {"campaignId": campaign_id}
+        self.get_context_state(context)["replication_key_value"] = bookmark.isoformat()
+
+    @staticmethod
+    def _parse_datetime(value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def report_path(tmp_path):
+    return tmp_path / "deferred_partitions.json"
+
+
+def _scheduler(report_path, weights: dict | None = None):
+    return PriorityScheduler(
+        weights or {},
+        report_path,
+        CoalescingStateWriter(_StateWriter(), 10),
+        LOGGER,
+    )
+
+
+def test_priority_order(report_path):
+    synced: list = []
+    reports = _Stream("reports", synced)
+    links = _Stream("links", synced)
+
+    for campaign_id, days_ago in (("fresh", 1), ("backfill", 30), ("week", 7)):
+        reports.set_bookmark(campaign_id, days_ago)
+
+    links.set_bookmark("fresh", 2)
+
+    scheduler = _scheduler(report_path, {"links": 2})
+    scheduler.schedule(reports, {"campaignId": "backfill"}, live=True)
+    scheduler.schedule(reports, {"campaignId": "week"}, live=True)
+    scheduler.schedule(reports, {"campaignId": "fresh"}, live=True)
+    scheduler.schedule(reports, {"campaignId": "paused"}, live=False)
+    scheduler.schedule(links, {"campaignId": "fresh"}, live=True)
+    scheduler.run()
+
+    assert synced == [
+        ("links", "fresh"),  # higher weight
+        ("reports", "fresh"),
+        ("reports", "week"),  # fewer days to sync than backfill
+        ("reports", "backfill"),
+        ("reports", "paused"),  # not live
+    ]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        EndpointUnavailableError("unhealthy"),
+        RetryBudgetExhaustedError("exhausted"),
+        RetriableAPIError("server error"),
+        ConnectionResetError("reset"),
+    ],
+)
+def test_defers_partition(report_path, error):
+    synced: list = []
+    stream = _Stream("reports", synced, {"c1": error})
+
+    scheduler = _scheduler(report_path)
+    scheduler.schedule(stream, {"campaignId": "c1"}, live=True)
+    scheduler.schedule(stream, {"campaignId": "c2"}, live=True)
+    scheduler.run()
+
+    # remaining partitions are still synced
+    assert synced == [("reports", "c1"), ("reports", "c2")]
+
+    # progress is discarded so the bookmark is not advanced
+    assert "progress_markers" not in stream.get_context_state({"campaignId": "c1"})
+
+    assert json.loads(report_path.read_text()) == [
+        {"stream": "reports", "context": {"campaignId": "c1"}, "reason": str(error)},
+    ]
+
+
+def test_fatal_error_not_deferred(report_path):
+    stream = _Stream("reports", [], {"c1": FatalAPIError("unauthorised")})
+
+    scheduler = _scheduler(report_path)
+    scheduler.schedule(stream, {"campaignId": "c1"}, live=True)
+
+    with pytest.raises(FatalAPIError):
+        scheduler.run()
+
+
+def test_previously_deferred_synced_first(report_path):
+    report_path.write_text(
+        json.dumps(
+            [{"stream": "reports", "context": {"campaignId": "c2"}, "reason": "x"}],
+        )
+    )
+
+    synced: list = []
+    stream = _Stream("reports", synced)
+
+    scheduler = _scheduler(report_path)
+    scheduler.schedule(stream, {"campaignId": "c1"}, live=True)
+    scheduler.schedule(stream, {"campaignId": "c2"}, live=False)
+    scheduler.run()
+
+    assert synced == [("reports", "c2"), ("reports", "c1")]
+
+    # synced successfully, so no longer deferred
+    assert json.loads(report_path.read_text()) == []
+
+
+def test_previously_deferred_carried_over(report_path):
+    previously_deferred = [
+        {"stream": "reports", "context": {"campaignId": "c1"}, "reason": "x"},
+        {"stream": "reports", "context": {"campaignId": "c2"}, "reason": "y"},
+    ]
+    report_path.write_text(json.dumps(previously_deferred))
+
+    stream = _Stream("reports", [], {"c1": EndpointUnavailableError("unhealthy")})
+
+    # c2 is not scheduled in this run, e.g. the campaign was filtered out
+    scheduler = _scheduler(report_path)
+    scheduler.schedule(stream, {"campaignId": "c1"}, live=True)
+    scheduler.run()
+
+    assert json.loads(report_path.read_text()) == [
+        {"stream": "reports", "context": {"campaignId": "c1"}, "reason": "unhealthy"},
+        {"stream": "reports", "context": {"campaignId": "c2"}, "reason": "y"},
+    ]
@@ -0,0 +1,167 @@
+"""Tests state handling."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+from singer_sdk.streams._state import StreamStateManager
+
+from tap_outbrain import state
+from tap_outbrain.state import CoalescingStateWriter, PartitionStateManager
+
+TAP_STATE = {
+    "bookmarks": {
+        "stream": {
+            "partitions": [
+                {"context": {"marketerId": "m1", "campaignId": "c1"}, "v": 1},
+                {"context": {"campaignId": "c2", "marketerId": "m1"}, "v": 2},
+                {"context": {"marketerId": "m2", "campaignId": "c3"}, "v": 3},
+            ]
+        }
+    }
+}
+
+
+def _state_managers(state_partitioning_keys=None):
+    return (
+        cls(
+            stream_name="stream",
+            tap_state=copy.deepcopy(TAP_STATE),
+            state_partitioning_keys=state_partitioning_keys,
+        )
+        for cls in (StreamStateManager, PartitionStateManager)
+    )
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        pytest.param({"marketerId": "m1", "campaignId": "c1"}, id="existing"),
+        pytest.param({"marketerId": "m1", "campaignId": "c2"}, id="key-order"),
+        pytest.param({"marketerId": "m2", "campaignId": "c4"}, id="new"),
+        pytest.param(None, id="stream"),
+    ],
+)
+def test_get_context_state_matches_sdk(context):
+    sdk, partition_state_manager = _state_managers()
+
+    expected = sdk.get_context_state(context)
+
+    assert partition_state_manager.get_context_state(context) == expected
+    assert partition_state_manager.tap_state == sdk.tap_state
+
+
+def test_get_context_state_matches_sdk_with_partitioning_keys():
+    sdk, partition_state_manager = _state_managers(["marketerId"])
+    context = {"marketerId": "m1", "campaignId": "c1"}
+
+    expected = sdk.get_context_state(context)
+
+    assert partition_state_manager.get_context_state(context) == expected
+    assert partition_state_manager.tap_state == sdk.tap_state
+
+
+def test_get_context_state_is_writable():
+    _, partition_state_manager = _state_managers()
+    context = {"marketerId": "m2", "campaignId": "c4"}
+
+    partition_state_manager.get_context_state(context)["v"] = 4
+
+    assert partition_state_manager.get_context_state(context)["v"] == 4
+    assert partition_state_manager.stream_state["partitions"][-1] == {
+        "context": context,
+        "v": 4,
+    }
+
+
+def test_index_rebuilt_when_state_replaced():
+    _, partition_state_manager = _state_managers()
+    context = {"marketerId": "m1", "campaignId": "c1"}
+    partition_state_manager.get_context_state(context)
+
+    partition_state_manager.stream_state["partitions"] = [
+        {"context": {"marketerId": "m1", "campaignId": "c1"}, "v": 5}
+    ]
+
+    assert partition_state_manager.get_context_state(context)["v"] == 5
+
+
+class _StateWriter:
+    def __init__(self) -> None:
+        self.written: list[dict] = []
+
+    def write_state(self, tap_state: dict) -> None:
+        self.written.append(tap_state)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch):
+    clock = _Clock()
+    monkeypatch.setattr(state.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def state_writer():
+    return _StateWriter()
+
+
+def test_writes_every_state_when_not_coalescing(state_writer, clock):
+    coalescing_state_writer = CoalescingStateWriter(state_writer, 60)
+
+    for i in range(3):
+        coalescing_state_writer.write_state({"v": i})
+
+    assert state_writer.written == [{"v": 0}, {"v": 1}, {"v": 2}]
+
+
+def test_coalesces_writes_within_interval(state_writer, clock):
+    coalescing_state_writer = CoalescingStateWriter(state_writer, 60)
+
+    with coalescing_state_writer.coalesce():
+        for i in range(3):
+            coalescing_state_writer.write_state({"v": i})
+
+        assert state_writer.written == [{"v": 0}]
+
+        clock.now += 60
+        coalescing_state_writer.write_state({"v": 3})
+        coalescing_state_writer.write_state({"v": 4})
+
+        assert state_writer.written == [{"v": 0}, {"v": 3}]
+
+    # pending state is written once coalescing ends
+    assert state_writer.written == [{"v": 0}, {"v": 3}, {"v": 4}]
+
+
+def test_no_pending_state_written_on_exit(state_writer, clock):
+    coalescing_state_writer = CoalescingStateWriter(state_writer, 60)
+
+    with coalescing_state_writer.coalesce():
+        coalescing_state_writer.write_state({"v": 0})
+
+    assert state_writer.written == [{"v": 0}]
+
+
+def test_pending_state_written_on_exception(state_writer, clock):
+    coalescing_state_writer = CoalescingStateWriter(state_writer, 60)
+
+    with pytest.raises(ValueError, match="failed"), coalescing_state_writer.coalesce():
+        coalescing_state_writer.write_state({"v": 0})
+        coalescing_state_writer.write_state({"v": 1})
+        raise ValueError("failed")
+
+    assert state_writer.written == [{"v": 0}, {"v": 1}]
+
+    # no longer coalescing
+    coalescing_state_writer.write_state({"v": 2})
+    assert state_writer.written == [{"v": 0}, {"v": 1}, {"v": 2}]